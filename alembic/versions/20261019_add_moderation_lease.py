@@ -0,0 +1,32 @@
+"""add moderation lease
+
+Revision ID: 20261019_add_moderation_lease
+Revises: 20261019_create_stored_objects
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261019_add_moderation_lease'
+down_revision = '20261019_create_stored_objects'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Moderator holding a claim on a pending post and when the claim expires
+    op.add_column('posts', sa.Column('claimed_by', sa.Integer(), sa.ForeignKey('users.id'), nullable=True))
+    op.add_column('posts', sa.Column('claimed_until', sa.DateTime(), nullable=True))
+    # The moderation queue only ever scans pending posts in date order
+    op.create_index(
+        'ix_posts_pending_date', 'posts', ['date'],
+        postgresql_where=sa.text("status = 'STATUS_NOT_CHECKED'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_pending_date', table_name='posts')
+    op.drop_column('posts', 'claimed_until')
+    op.drop_column('posts', 'claimed_by')
@@ -0,0 +1,26 @@
+"""add updated_at
+
+Revision ID: 20261019_add_updated_at
+Revises: 20240321_create_enums
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261019_add_updated_at'
+down_revision = '20240321_create_enums'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Version timestamp used to build ETags for posts and user profiles
+    op.add_column('posts', sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()))
+    op.add_column('users', sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'updated_at')
+    op.drop_column('posts', 'updated_at')
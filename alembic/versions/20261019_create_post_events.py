@@ -0,0 +1,34 @@
+"""create post_events
+
+Revision ID: 20261019_create_post_events
+Revises: 20261019_add_moderation_lease
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261019_create_post_events'
+down_revision = '20261019_add_moderation_lease'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Append-only audit log of post lifecycle changes
+    op.create_table(
+        'post_events',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('event_type', sa.String(32), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_post_events_post_id_created_at', 'post_events', ['post_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_events_post_id_created_at', table_name='post_events')
+    op.drop_table('post_events')
@@ -0,0 +1,30 @@
+"""create stored_objects
+
+Revision ID: 20261019_create_stored_objects
+Revises: 20261019_add_updated_at
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261019_create_stored_objects'
+down_revision = '20261019_add_updated_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Reference counts of content-addressed images
+    op.create_table(
+        'stored_objects',
+        sa.Column('object_name', sa.String(), primary_key=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('stored_objects')
@@ -1,10 +1,13 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, admin, moderator, post, user
+from app.api.v1.endpoints import auth, admin, moderator, post, user, jobs, image, metrics
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
 api_router.include_router(admin.router)
 api_router.include_router(moderator.router)
 api_router.include_router(post.router)
-api_router.include_router(user.router) 
\ No newline at end of file
+api_router.include_router(user.router)
+api_router.include_router(jobs.router)
+api_router.include_router(image.router)
+api_router.include_router(metrics.router) 
\ No newline at end of file
@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from fastapi.responses import FileResponse, Response
+from app.core.exceptions import ResourceNotFoundException
+from app.core.images import has_renditions
+from app.core.services.minio_service import MinioService
+
+router = APIRouter(
+    prefix="/images",
+    tags=["Изображения"],
+    responses={404: {"description": "Not found"}},
+)
+
+# Content-addressed names never change their bytes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+
+@router.get("/{file_name}")
+async def get_image(file_name: str):
+    minio_service = MinioService()
+    media_type = minio_service.get_content_type(file_name)
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL if has_renditions(file_name) else DEFAULT_CACHE_CONTROL}
+
+    try:
+        local_path = minio_service.storage.local_path(file_name)
+    except Exception:
+        raise ResourceNotFoundException("Image not found")
+    if local_path is not None:
+        # Streamed from disk, zero-copy when the ASGI server supports the pathsend extension
+        return FileResponse(local_path, media_type=media_type, headers=headers)
+
+    content = await minio_service.get_file(file_name)
+    if content is None:
+        raise ResourceNotFoundException("Image not found")
+    return Response(content=content, media_type=media_type, headers=headers)
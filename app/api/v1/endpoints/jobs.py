@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.exceptions import ResourceNotFoundException
+from app.core.job_queue import job_queue
+from app.core.auth import require_admin
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Фоновые задачи"],
+    responses={404: {"description": "Not found"}},
+)
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+@router.get("/get-metrics")
+async def get_metrics(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    await require_admin(token, db, "Only administrators can view background jobs")
+    return job_queue.get_metrics()
+
+@router.get("/get-recent-jobs")
+async def get_recent_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    await require_admin(token, db, "Only administrators can view background jobs")
+    return [job.to_dict() for job in job_queue.get_recent_jobs(limit)]
+
+@router.get("/get-job-status/{job_id}")
+async def get_job_status(
+    job_id: str,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    await require_admin(token, db, "Only administrators can view background jobs")
+
+    job = job_queue.get_job(job_id)
+    if job is None:
+        raise ResourceNotFoundException("Job not found")
+    return job.to_dict()
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.tracing import phase_histograms
+from app.core.query_counter import query_metrics
+from app.core.event_bus import event_bus
+from app.core.feed_updates import feed_updates
+from app.core.rate_limit import get_rate_limiter
+from app.core.auth import require_admin
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Метрики"],
+    responses={404: {"description": "Not found"}},
+)
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+@router.get("/get-phase-metrics")
+async def get_phase_metrics(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    await require_admin(token, db)
+    return phase_histograms.get_metrics()
+
+@router.get("/get-query-metrics")
+async def get_query_metrics(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    await require_admin(token, db)
+    return query_metrics.get_metrics()
+
+@router.get("/get-event-metrics")
+async def get_event_metrics(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    await require_admin(token, db)
+    return event_bus.get_metrics()
+
+@router.get("/get-stream-metrics")
+async def get_stream_metrics(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    await require_admin(token, db)
+    return feed_updates.get_metrics()
+
+@router.get("/get-rate-limit-metrics")
+async def get_rate_limit_metrics(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    await require_admin(token, db)
+    return get_rate_limiter().get_metrics()
\ No newline at end of file
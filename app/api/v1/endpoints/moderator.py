@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
@@ -6,6 +6,9 @@ from app.core.services.moderator_service import ModeratorService
 from app.core.services.post_service import PostService
 from app.core.services.user_service import UserService
 from app.core.services.minio_service import MinioService
+from app.core.exceptions import UnauthorizedException
+from app.core.responses import ORJSONModelResponse
+from app.schemas.post import ModerationClaimResponse, ModerationDecisionRequest, ModerationDecisionResponse
 
 router = APIRouter(
     prefix="/moderators",
@@ -39,4 +42,58 @@ async def set_decision(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
-        ) 
\ No newline at end of file
+        )
+
+@router.post("/claim-posts", response_model=ModerationClaimResponse, response_class=ORJSONModelResponse)
+async def claim_posts(
+    limit: int = Query(20, ge=1, le=100),
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    minio_service = MinioService()
+    post_service = PostService(
+        db=db,
+        user_service=UserService(db, minio_service),
+        minio_service=minio_service
+    )
+    moderator_service = ModeratorService(db, post_service, minio_service)
+
+    user_service = UserService(db, minio_service)
+    current_user = await user_service.get_current_user(token)
+
+    try:
+        return ORJSONModelResponse(await moderator_service.claim_posts(current_user, limit))
+    except UnauthorizedException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/decide-posts", response_model=ModerationDecisionResponse)
+async def decide_posts(
+    request: ModerationDecisionRequest,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    minio_service = MinioService()
+    post_service = PostService(
+        db=db,
+        user_service=UserService(db, minio_service),
+        minio_service=minio_service
+    )
+    moderator_service = ModeratorService(db, post_service, minio_service)
+
+    user_service = UserService(db, minio_service)
+    current_user = await user_service.get_current_user(token)
+
+    try:
+        return await moderator_service.decide_posts(current_user, request)
+    except UnauthorizedException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
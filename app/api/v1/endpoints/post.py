@@ -1,18 +1,25 @@
 import json
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Header
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional, List
+from pydantic import TypeAdapter
 from pydantic_core import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.post import PostRequest, PostResponse, PageResponse, PageResponseWrapper
-from app.models.enums import PostSort
+from app.schemas.post import PostRequest, PostResponse, PageResponse, PageResponseWrapper, BulkPostRequest, BulkPostResponse
+from app.models.enums import PostSort, ImageResponseMode
 from app.models.user import User
-from app.core.database import get_db
+from app.core.config.config import settings
+from app.core.database import get_db, async_session
 from app.core.services.post_service import PostService
 from app.core.services.user_service import UserService
 from app.core.services.minio_service import MinioService
+from app.core.uploads import read_json_part
+from app.core.exceptions import NotModifiedException
+from app.core.responses import ORJSONModelResponse
+from app.core.feed_updates import feed_updates
 
 router = APIRouter(
     prefix="/posts",
@@ -20,13 +27,15 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
-@router.get("/get-posts-data")
+@router.get("/get-posts-data", response_class=ORJSONModelResponse)
 async def get_posts(
     page: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     sort: str = "latest",
     search: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     token: Optional[str] = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ):
@@ -43,7 +52,8 @@ async def get_posts(
         current_user = await user_service.get_current_user(token)
     
     try:
-        return await post_service.find_all_posts(page, limit, sort, search, current_user)
+        page_response = await post_service.find_all_posts(page, limit, sort, search, current_user, if_none_match)
+        return ORJSONModelResponse(page_response, headers={"ETag": page_response.etag})
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -52,15 +62,76 @@ async def get_posts(
             detail=f"Error finding posts: {str(e)}"
         )
 
+@router.get("/export-posts-data")
+async def export_posts(
+    sort: str = "latest",
+    search: Optional[str] = None,
+    include_images: bool = False,
+    token: str = Depends(oauth2_scheme)
+):
+    # The stream outlives the request dependencies, so the export owns its session
+    db = async_session()
+    try:
+        minio_service = MinioService()
+        user_service = UserService(db, minio_service)
+        post_service = PostService(
+            db=db,
+            user_service=user_service,
+            minio_service=minio_service
+        )
+        current_user = await user_service.get_current_user(token)
+        rows = await post_service.export_posts(sort, search, current_user, include_images)
+    except Exception:
+        await db.close()
+        raise
+
+    async def stream():
+        try:
+            async for chunk in rows:
+                yield chunk
+        finally:
+            await db.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.get("/stream-updates")
+async def stream_updates(
+    access_token: Optional[str] = Query(None, description="Токен для EventSource, который не умеет передавать заголовки"),
+    token: Optional[str] = Depends(optional_oauth2_scheme)
+):
+    """Server-Sent Events with feed deltas: approved posts, like counts, deletions
+    and, for signed-in users, moderation results of their own posts"""
+    if not feed_updates.can_accept():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many update streams",
+            headers={"Retry-After": "30"}
+        )
+
+    user_id = None
+    token = token or access_token
+    if token is not None:
+        # The session is only needed to resolve the user, not for the life of the stream
+        async with async_session() as db:
+            current_user = await UserService(db, MinioService()).get_current_user(token)
+            user_id = current_user.id
+
+    return StreamingResponse(
+        feed_updates.stream(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/create-post")
 async def create_post(
     post: UploadFile = File(...),
     image: Optional[UploadFile] = File(None),
+    image_mode: ImageResponseMode = Query(ImageResponseMode.BASE64),
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        post_data = json.loads(await post.read())
+        post_data = json.loads(await read_json_part(post))
         post_obj = PostRequest(**post_data) 
     except (json.JSONDecodeError, ValidationError) as e:
         raise HTTPException(
@@ -79,16 +150,45 @@ async def create_post(
     current_user = await user_service.get_current_user(token)
     
     try:
-        return await post_service.create_post(current_user, post_obj, image)
+        return await post_service.create_post(current_user, post_obj, image, image_mode)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
-@router.get("/get-post-data/{post_id}")
+@router.post("/create-posts", response_model=BulkPostResponse)
+async def create_posts(
+    posts: UploadFile = File(...),
+    images: List[UploadFile] = File([]),
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        posts_data = json.loads(await read_json_part(posts, settings.BULK_JSON_PART_SIZE))
+        post_requests = TypeAdapter(List[BulkPostRequest]).validate_python(posts_data)
+    except (json.JSONDecodeError, ValidationError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    minio_service = MinioService()
+    post_service = PostService(
+        db=db,
+        user_service=UserService(db, minio_service),
+        minio_service=minio_service
+    )
+
+    user_service = UserService(db, minio_service)
+    current_user = await user_service.get_current_user(token)
+
+    return await post_service.create_posts(current_user, post_requests, images)
+
+@router.get("/get-post-data/{post_id}", response_class=ORJSONModelResponse)
 async def get_post(
     post_id: int,
+    if_none_match: Optional[str] = Header(None),
     token: Optional[str] = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ):
@@ -105,7 +205,10 @@ async def get_post(
         current_user = await user_service.get_current_user(token)
     
     try:
-        return await post_service.get_post_data(post_id, current_user)
+        post_response = await post_service.get_post_data(post_id, current_user, if_none_match)
+        return ORJSONModelResponse(post_response, headers={"ETag": post_response.etag})
+    except NotModifiedException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -116,11 +219,12 @@ async def get_post(
 async def update_post(
     post: UploadFile = File(...),
     image: Optional[UploadFile] = File(None),
+    image_mode: ImageResponseMode = Query(ImageResponseMode.BASE64),
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        post_data = json.loads(await post.read())
+        post_data = json.loads(await read_json_part(post))
         post_obj = PostRequest(**post_data) 
     except (json.JSONDecodeError, ValidationError) as e:
         raise HTTPException(
@@ -138,7 +242,7 @@ async def update_post(
     current_user = await user_service.get_current_user(token)
     
     try:
-        return await post_service.update_post_data(current_user, post_obj, image)
+        return await post_service.update_post_data(current_user, post_obj, image, image_mode)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -219,7 +323,7 @@ async def resubmit_post(
             detail=str(e)
         )
 
-@router.get("/get-recommended-posts-data")
+@router.get("/get-recommended-posts-data", response_class=ORJSONModelResponse)
 async def get_recommended_posts(
     db: AsyncSession = Depends(get_db)
 ):
@@ -231,7 +335,7 @@ async def get_recommended_posts(
     )
     
     try:
-        return await post_service.find_recommended_posts()
+        return ORJSONModelResponse(await post_service.find_recommended_posts())
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,5 +1,5 @@
 import json
-from fastapi import APIRouter, Depends, Form, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, Form, HTTPException, status, UploadFile, File, Header, Response, Query
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional
 from pydantic_core import ValidationError
@@ -16,6 +16,9 @@ from app.core.database import get_db
 from app.core.services.user_service import UserService
 from app.core.services.auth_service import AuthenticationService
 from app.core.services.minio_service import MinioService
+from app.core.uploads import read_json_part
+from app.core.exceptions import NotModifiedException
+from app.models.enums import ImageResponseMode
 
 settings = get_settings()
 
@@ -52,6 +55,8 @@ async def check_session(
 
 @router.get("/get-user-data")
 async def get_user_data(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ):
@@ -59,7 +64,11 @@ async def get_user_data(
     user_service = UserService(db, minio_service)
     current_user = await user_service.get_current_user(token)
     try:
-        return await user_service.get_user_data(current_user)
+        user_response = await user_service.get_user_data(current_user, if_none_match)
+        response.headers["ETag"] = user_response.etag
+        return user_response
+    except NotModifiedException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,11 +79,12 @@ async def get_user_data(
 async def update_user(
     user: UploadFile = File(...),
     image: Optional[UploadFile] = File(None),
+    image_mode: ImageResponseMode = Query(ImageResponseMode.BASE64),
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        user_data = json.loads(await user.read())
+        user_data = json.loads(await read_json_part(user))
         user_obj = UserEditRequest(**user_data) 
     except (json.JSONDecodeError, ValidationError) as e:
         raise HTTPException(
@@ -86,7 +96,7 @@ async def update_user(
     user_service = UserService(db, minio_service)
     current_user = await user_service.get_current_user(token)
     try:
-        return await user_service.update_user_data(current_user, user_obj, image)
+        return await user_service.update_user_data(current_user, user_obj, image, image_mode)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
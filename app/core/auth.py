@@ -1,5 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import UnauthorizedException
+from app.models.enums import Role
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+async def require_admin(token: str, db: AsyncSession, message: str = "Only administrators can view metrics") -> None:
+    """Operational endpoints (metrics, job queue) expose internals, only administrators may read them"""
+    # UserService imports this module for oauth2_scheme
+    from app.core.services.user_service import UserService
+    from app.core.services.minio_service import MinioService
+
+    current_user = await UserService(db, MinioService()).get_current_user(token)
+    if current_user.role != Role.ROLE_ADMIN:
+        raise UnauthorizedException(message)
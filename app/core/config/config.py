@@ -2,7 +2,7 @@ from pydantic_settings import BaseSettings
 from functools import lru_cache
 import os
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import validator, Field
 
 load_dotenv()
@@ -29,10 +29,92 @@ class Settings(BaseSettings):
     MINIO_BUCKET: str = Field(..., env="MINIO_BUCKET")
     MINIO_ACCESS_KEY: str = Field(..., env="MINIO_ACCESS_KEY")
     MINIO_SECRET_KEY: str = Field(..., env="MINIO_SECRET_KEY")
+
+    # Storage backend settings: "minio" or "local"
+    STORAGE_BACKEND: str = "minio"
+    LOCAL_STORAGE_PATH: str = "uploads"
+
+    # Image cache settings, 0 disables a tier
+    IMAGE_MEMORY_CACHE_BYTES: int = 64 * 1024 * 1024  # 64MB per worker
+    IMAGE_DISK_CACHE_BYTES: int = 1024 * 1024 * 1024  # 1GB per host
+    IMAGE_DISK_CACHE_PATH: str = "uploads/.cache"
     
     # File upload settings
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     MAX_REQUEST_SIZE: int = 10 * 1024 * 1024  # 10MB
+    MAX_JSON_PART_SIZE: int = 64 * 1024  # 64KB
+    UPLOAD_PART_SIZE: int = 5 * 1024 * 1024  # 5MB, the S3 minimum for multipart parts
+    BULK_MAX_POSTS: int = 100
+    BULK_JSON_PART_SIZE: int = 1024 * 1024  # 1MB
+    BULK_UPLOAD_CONCURRENCY: int = 4
+
+    # Response compression settings
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # 1KB
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Schema version check at startup: "strict" refuses to start, "warn" only logs, "off" skips it
+    SCHEMA_VERSION_CHECK: str = "warn"
+
+    # Startup warmup settings
+    WARMUP_ENABLED: bool = False
+    WARMUP_TIME_BUDGET_SECONDS: float = 10.0
+    WARMUP_FEED_PAGES: int = 2
+    WARMUP_PAGE_SIZE: int = 10
+
+    # Per-request phase spans returned in the Server-Timing header
+    SERVER_TIMING_ENABLED: bool = True
+
+    # SQL statement counting per request, budgets are keyed by "METHOD /route/path"
+    QUERY_COUNTER_ENABLED: bool = True
+    QUERY_BUDGET_DEFAULT: int = 20
+    QUERY_BUDGETS: Dict[str, int] = {}
+    QUERY_REPEAT_THRESHOLD: int = 5
+
+    # Post lifecycle event bus settings
+    EVENT_BUS_MAX_SIZE: int = 10000
+    EVENT_BUS_BATCH_SIZE: int = 500
+    EVENT_BUS_FLUSH_SECONDS: float = 1.0
+    EVENT_BUS_PUBLISH_TIMEOUT_SECONDS: float = 0.5
+
+    # Server-Sent Events feed updates, limits are per worker process
+    SSE_MAX_CONNECTIONS: int = 10000
+    SSE_CLIENT_QUEUE_SIZE: int = 100
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+
+    # Rate limiting, policies are "<ip|user>:<requests>/<seconds>" keyed by "METHOD /route/path[?param]"
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "sqlite" shares the buckets between workers on one host
+    RATE_LIMIT_SQLITE_PATH: str = "uploads/.ratelimit.sqlite3"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_DEFAULT: Optional[str] = None
+    RATE_LIMIT_POLICIES: Dict[str, str] = {
+        "POST /api/v1/auth/sign-in": "ip:10/60",
+        "POST /api/v1/auth/sign-up": "ip:5/60",
+        "PUT /api/v1/users/change-password": "user:5/60",
+        "POST /api/v1/posts/like-post/{post_id}": "user:60/60",
+        "GET /api/v1/posts/get-posts-data?search": "user:30/60",
+    }
+
+    # Moderation queue settings
+    MODERATION_LEASE_SECONDS: int = 300
+    MODERATION_CLAIM_MAX: int = 50
+
+    # Request profiling settings, the middleware is not installed when disabled
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.01
+    PROFILING_INTERVAL_SECONDS: float = 0.005
+    PROFILING_OUTPUT_DIR: str = "profiles"
+    PROFILING_HEADER: str = "X-Profile"
+
+    # Background job queue settings
+    JOB_QUEUE_WORKERS: int = 2
+    JOB_PROCESS_WORKERS: int = 2
+    JOB_QUEUE_MAX_SIZE: int = 1000
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_DELAY_SECONDS: float = 0.5
     
     @validator("DATABASE_URL")
     def validate_database_url(cls, v):
@@ -3,6 +3,8 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config.config import settings
+from app.core.tracing import span
+from app.core.query_counter import install_query_counter
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
@@ -18,9 +20,80 @@ engine = create_async_engine(
     pool_recycle=1800,
 )
 
+if settings.QUERY_COUNTER_ENABLED:
+    install_query_counter(engine)
+
+class _TracedStreamResult:
+    """Streamed result whose row fetches are recorded in the "db" span"""
+
+    def __init__(self, result):
+        self._result = result
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        with span("db"):
+            return await self._result.__anext__()
+
+    async def partitions(self, size=None):
+        partitions = self._result.partitions(size)
+        while True:
+            with span("db"):
+                try:
+                    partition = await partitions.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield partition
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+class TracedAsyncSession(AsyncSession):
+    """AsyncSession recording statement execution time in the request's "db" span.
+
+    Streamed results are wrapped so the fetches made while iterating count too.
+    """
+
+    async def execute(self, *args, **kwargs):
+        with span("db"):
+            return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        with span("db"):
+            return await super().scalar(*args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        with span("db"):
+            return await super().scalars(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        with span("db"):
+            return await super().get(*args, **kwargs)
+
+    async def stream(self, *args, **kwargs):
+        with span("db"):
+            return _TracedStreamResult(await super().stream(*args, **kwargs))
+
+    async def stream_scalars(self, *args, **kwargs):
+        with span("db"):
+            return _TracedStreamResult(await super().stream_scalars(*args, **kwargs))
+
+    async def refresh(self, *args, **kwargs):
+        with span("db"):
+            return await super().refresh(*args, **kwargs)
+
+    async def flush(self, *args, **kwargs):
+        with span("db"):
+            return await super().flush(*args, **kwargs)
+
+    async def commit(self):
+        with span("db"):
+            return await super().commit()
+
 async_session = async_sessionmaker(
     engine,
-    class_=AsyncSession,
+    class_=TracedAsyncSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False
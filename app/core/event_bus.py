@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import insert
+from app.core.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+BATCH_ROOM_POLL_SECONDS = 0.01
+
+
+class PostEventType:
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    LIKED = "liked"
+    UNLIKED = "unliked"
+    RESUBMITTED = "resubmitted"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
+
+@dataclass
+class LifecycleEvent:
+    event_type: str
+    post_id: int
+    actor_id: Optional[int] = None
+    payload: Optional[Dict[str, Any]] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "event_type": self.event_type,
+            "post_id": self.post_id,
+            "actor_id": self.actor_id,
+            "payload": self.payload,
+            "created_at": self.created_at,
+        }
+
+
+EventHandler = Callable[[List[LifecycleEvent]], Awaitable[None]]
+
+
+class EventBus:
+    """In-process bus for post lifecycle events.
+
+    Publishers only enqueue; a single writer task drains the queue in batches,
+    appends them to post_events with one multi-row INSERT and then hands the batch
+    to subscribers. When the queue is full publishers wait up to `publish_timeout`
+    before the event is dropped, so a stalled database slows writes down instead
+    of growing memory without bound.
+    """
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float, publish_timeout: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.publish_timeout = publish_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._subscribers: List[EventHandler] = []
+
+        self.published = 0
+        self.persisted = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def started(self) -> bool:
+        return self._queue is not None
+
+    def subscribe(self, handler: EventHandler) -> None:
+        """Register a coroutine called with every persisted batch, off the request path"""
+        if handler not in self._subscribers:
+            self._subscribers.append(handler)
+
+    async def start(self) -> None:
+        if self.started:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._writer_task = asyncio.create_task(self._writer())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush buffered events within the timeout, then stop the writer"""
+        if not self.started:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Event bus stopped with %d unflushed events", self._queue.qsize())
+        self._writer_task.cancel()
+        await asyncio.gather(self._writer_task, return_exceptions=True)
+        self._writer_task = None
+        self._queue = None
+
+    async def publish(self, event: LifecycleEvent) -> None:
+        """Enqueue an event, waiting for room when the buffer is full"""
+        if not self.started:
+            return
+        try:
+            await asyncio.wait_for(self._queue.put(event), timeout=self.publish_timeout)
+            self.published += 1
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            logger.warning("Event bus is full, dropped %s event for post %s", event.event_type, event.post_id)
+
+    async def publish_many(self, events: List[LifecycleEvent]) -> None:
+        """Enqueue a batch as one operation: all events once there is room for them, or none after the timeout"""
+        if not self.started or not events:
+            return
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.publish_timeout
+        # asyncio.Queue cannot reserve several slots, so room is polled while the buffer is full
+        while self._queue.maxsize - self._queue.qsize() < len(events):
+            if len(events) > self._queue.maxsize or loop.time() >= deadline:
+                self.dropped += len(events)
+                logger.warning("Event bus is full, dropped a batch of %d events", len(events))
+                return
+            await asyncio.sleep(min(BATCH_ROOM_POLL_SECONDS, max(0.0, deadline - loop.time())))
+        for event in events:
+            self._queue.put_nowait(event)
+        self.published += len(events)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "queueDepth": self._queue.qsize() if self.started else 0,
+            "published": self.published,
+            "persisted": self.persisted,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    async def _writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[LifecycleEvent]) -> None:
+        from app.core.database import async_session
+        from app.models.post_event import PostEvent
+        try:
+            async with async_session() as session:
+                await session.execute(insert(PostEvent), [event.to_row() for event in batch])
+                await session.commit()
+            self.persisted += len(batch)
+            self.batches += 1
+        except Exception as e:
+            # Subscribers still get the batch, the audit log is the only loss
+            self.failed += len(batch)
+            logger.error("Failed to persist %d post events: %s", len(batch), e)
+
+        for handler in self._subscribers:
+            try:
+                await handler(batch)
+            except Exception:
+                logger.exception("Event subscriber %r failed", handler)
+
+
+event_bus = EventBus(
+    max_size=settings.EVENT_BUS_MAX_SIZE,
+    batch_size=settings.EVENT_BUS_BATCH_SIZE,
+    flush_interval=settings.EVENT_BUS_FLUSH_SECONDS,
+    publish_timeout=settings.EVENT_BUS_PUBLISH_TIMEOUT_SECONDS,
+)
@@ -1,5 +1,5 @@
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError, HTTPException
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
@@ -7,7 +7,8 @@ from app.core.exceptions import (
     ResourceNotFoundException,
     UnauthorizedException,
     BadRequestException,
-    StorageUnavailableException
+    StorageUnavailableException,
+    NotModifiedException
 )
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -46,6 +47,12 @@ async def storage_unavailable_handler(request: Request, exc: StorageUnavailableE
         content={"errors": [exc.detail]},
     )
 
+async def not_modified_handler(request: Request, exc: NotModifiedException):
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=exc.headers,
+    )
+
 async def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError):
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -20,6 +20,10 @@ class BadRequestException(HTTPException):
     def __init__(self, detail: str):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
+class NotModifiedException(HTTPException):
+    def __init__(self, etag: str):
+        super().__init__(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,151 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+import orjson
+from app.core.config.config import settings
+from app.core.event_bus import LifecycleEvent, PostEventType
+from app.models.enums import PostStatus
+
+# Reconnection delay announced to EventSource clients
+RECONNECT_DELAY_MS = 3000
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+class _Connection:
+    __slots__ = ("user_id", "queue", "evicted")
+
+    def __init__(self, user_id: Optional[int], queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.evicted = False
+
+
+class FeedUpdates:
+    """Fans post lifecycle events out to Server-Sent Events connections.
+
+    Each delta is encoded once and the same bytes are queued on every connection,
+    so a batch costs one serialization per event regardless of the audience. Like
+    changes within a batch are coalesced to the latest count per post. A client
+    that lets its queue fill up is evicted instead of buffering without bound; it
+    reconnects through the EventSource retry.
+
+    Events come from this process's event bus, so every worker serves the writes
+    it handled itself.
+    """
+
+    def __init__(self, max_connections: int, queue_size: int, heartbeat: float):
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._connections: Set[_Connection] = set()
+        self._by_user: Dict[int, Set[_Connection]] = {}
+        self.sent = 0
+        self.evicted = 0
+
+    @property
+    def connections(self) -> int:
+        return len(self._connections)
+
+    def can_accept(self) -> bool:
+        return len(self._connections) < self.max_connections
+
+    async def stream(self, user_id: Optional[int]) -> AsyncIterator[bytes]:
+        """SSE body for one client, ends when the client disconnects or is evicted"""
+        connection = _Connection(user_id, self.queue_size)
+        self._connections.add(connection)
+        if user_id is not None:
+            self._by_user.setdefault(user_id, set()).add(connection)
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n\n".encode()
+            while not (connection.evicted and connection.queue.empty()):
+                try:
+                    yield await asyncio.wait_for(connection.queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing idle connections
+                    yield b": ping\n\n"
+        finally:
+            self._remove(connection)
+
+    async def handle_events(self, batch: List[LifecycleEvent]) -> None:
+        """Event bus subscriber turning persisted lifecycle events into feed deltas.
+
+        Deltas about a denied post go to its author only, the feeds of everyone
+        else do not contain it. A resubmitted post is back in those feeds and is
+        announced again as a new post.
+        """
+        likes: Dict[int, Dict[str, Any]] = {}
+        for event in batch:
+            payload = event.payload or {}
+            author_id = payload.get("authorId")
+            if event.event_type in (PostEventType.LIKED, PostEventType.UNLIKED):
+                likes[event.post_id] = payload
+            elif event.event_type in (PostEventType.APPROVED, PostEventType.REJECTED):
+                decision = "approved" if event.event_type == PostEventType.APPROVED else "rejected"
+                if decision == "approved":
+                    self._broadcast(format_sse("post", {"id": event.post_id}))
+                else:
+                    # Pending posts are listed in the feed, a rejected one drops out of it
+                    self._broadcast(format_sse("deleted", {"id": event.post_id}), exclude_user=author_id)
+                if author_id is not None:
+                    self._send_to_user(author_id, format_sse("moderation", {"id": event.post_id, "decision": decision}))
+            elif event.event_type == PostEventType.RESUBMITTED:
+                # The author's own feed always listed the post
+                self._broadcast(format_sse("post", {"id": event.post_id}), exclude_user=author_id)
+            elif event.event_type == PostEventType.DELETED:
+                self._publish(format_sse("deleted", {"id": event.post_id}), payload)
+        for post_id, payload in likes.items():
+            self._publish(format_sse("likes", {"id": post_id, "likes": payload.get("likes")}), payload)
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            "connections": len(self._connections),
+            "users": len(self._by_user),
+            "sent": self.sent,
+            "evicted": self.evicted,
+        }
+
+    def _publish(self, message: bytes, payload: Dict[str, Any]) -> None:
+        """Broadcast a delta, or send it to the author only when the post is denied"""
+        if payload.get("status") == PostStatus.STATUS_DENIED.value:
+            if payload.get("authorId") is not None:
+                self._send_to_user(payload["authorId"], message)
+            return
+        self._broadcast(message)
+
+    def _broadcast(self, message: bytes, exclude_user: Optional[int] = None) -> None:
+        for connection in list(self._connections):
+            if exclude_user is None or connection.user_id != exclude_user:
+                self._offer(connection, message)
+
+    def _send_to_user(self, user_id: int, message: bytes) -> None:
+        for connection in list(self._by_user.get(user_id, ())):
+            self._offer(connection, message)
+
+    def _offer(self, connection: _Connection, message: bytes) -> None:
+        if connection.evicted:
+            return
+        try:
+            connection.queue.put_nowait(message)
+            self.sent += 1
+        except asyncio.QueueFull:
+            connection.evicted = True
+            self.evicted += 1
+            self._remove(connection)
+
+    def _remove(self, connection: _Connection) -> None:
+        self._connections.discard(connection)
+        if connection.user_id is not None:
+            user_connections = self._by_user.get(connection.user_id)
+            if user_connections is not None:
+                user_connections.discard(connection)
+                if not user_connections:
+                    del self._by_user[connection.user_id]
+
+
+feed_updates = FeedUpdates(
+    max_connections=settings.SSE_MAX_CONNECTIONS,
+    queue_size=settings.SSE_CLIENT_QUEUE_SIZE,
+    heartbeat=settings.SSE_HEARTBEAT_SECONDS,
+)
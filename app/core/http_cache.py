@@ -0,0 +1,23 @@
+import hashlib
+from typing import Any, Optional
+
+
+def make_weak_etag(*parts: Any) -> str:
+    """Build a weak ETag from the version data of a resource"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against the current ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+    return _opaque_tag(etag) in candidates
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
@@ -0,0 +1,79 @@
+import io
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+DEFAULT_POST_IMAGE = "default-post-img.png"
+DEFAULT_USER_IMAGE = "default-user-img.png"
+
+
+@dataclass(frozen=True)
+class RenditionSpec:
+    max_size: int
+    format: str
+    extension: str
+    content_type: str
+    quality: int
+
+
+RENDITIONS: Dict[str, RenditionSpec] = {
+    "thumb": RenditionSpec(480, "JPEG", "jpg", "image/jpeg", 80),
+    "detail": RenditionSpec(1280, "JPEG", "jpg", "image/jpeg", 85),
+    "webp": RenditionSpec(1280, "WEBP", "webp", "image/webp", 80),
+}
+
+# Renditions tried in order for each kind of endpoint, the original is the last resort
+FEED_RENDITIONS: Tuple[str, ...] = ("thumb",)
+DETAIL_RENDITIONS: Tuple[str, ...] = ("webp", "detail")
+
+
+def has_renditions(file_name: str) -> bool:
+    """Default images are stored as-is and never get derived renditions"""
+    return file_name not in (DEFAULT_POST_IMAGE, DEFAULT_USER_IMAGE)
+
+
+def rendition_name(file_name: str, rendition: str) -> str:
+    """Deterministic object name of a rendition stored next to the original"""
+    stem = file_name.rsplit(".", 1)[0]
+    return f"{stem}_{rendition}.{RENDITIONS[rendition].extension}"
+
+
+def render_image(data: bytes) -> Dict[str, bytes]:
+    """Decode an image and encode all renditions without its metadata.
+
+    Raises PIL.UnidentifiedImageError if the data is not a supported image.
+    """
+    # Pillow is only needed by the rendition jobs, not by application startup
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        # Apply the EXIF orientation before the metadata is dropped
+        image = ImageOps.exif_transpose(source)
+        image.load()
+
+    renditions = {}
+    for name, spec in RENDITIONS.items():
+        resized = image.copy()
+        resized.thumbnail((spec.max_size, spec.max_size), Image.LANCZOS)
+        resized = _convert_for_format(resized, spec.format)
+
+        buffer = io.BytesIO()
+        resized.save(buffer, format=spec.format, quality=spec.quality, optimize=True)
+        renditions[name] = buffer.getvalue()
+    return renditions
+
+
+def _convert_for_format(image, image_format: str):
+    from PIL import Image
+
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    if image_format == "JPEG":
+        if has_alpha:
+            # JPEG has no alpha channel, flatten onto a white background
+            rgba = image.convert("RGBA")
+            background = Image.new("RGB", rgba.size, (255, 255, 255))
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            return background
+        return image.convert("RGB") if image.mode != "RGB" else image
+    if image.mode not in ("RGB", "RGBA"):
+        return image.convert("RGBA" if has_alpha else "RGB")
+    return image
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from app.core.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    RETRYING = "RETRYING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+@dataclass
+class Job:
+    id: str
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    args: tuple
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "finishedAt": self.finished_at,
+        }
+
+
+class JobQueue:
+    """In-process asyncio job queue.
+
+    Coroutine jobs are run by a pool of worker tasks; CPU-bound steps inside a job
+    are offloaded to a process pool with `run_cpu`. No external broker is needed.
+    """
+
+    def __init__(self, workers: int, process_workers: int, max_size: int, max_attempts: int,
+                 retry_delay: float, history_size: int = 1000):
+        self.workers = workers
+        self.process_workers = process_workers
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.history_size = history_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.running = 0
+        self.durations: Deque[float] = deque(maxlen=history_size)
+
+    @property
+    def started(self) -> bool:
+        return self._queue is not None
+
+    async def start(self) -> None:
+        if self.started:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        # spawn keeps the event loop and open connections out of the child processes
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.process_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Let queued jobs finish within the timeout, then cancel the workers"""
+        if not self.started:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Job queue stopped with %d pending jobs", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._tasks = []
+        self._pool = None
+        self._queue = None
+
+    def submit(self, name: str, func: Callable[..., Awaitable[Any]], *args: Any) -> Job:
+        """Enqueue a coroutine function, raises asyncio.QueueFull when the queue is full"""
+        if not self.started:
+            raise RuntimeError("Job queue is not started")
+        job = Job(id=str(uuid.uuid4()), name=name, func=func, args=args)
+        self._queue.put_nowait(job)
+        self._remember(job)
+        self.submitted += 1
+        return job
+
+    async def run_cpu(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a picklable CPU-bound function in the process pool"""
+        if self._pool is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def get_recent_jobs(self, limit: int) -> List[Job]:
+        return list(self._jobs.values())[-limit:][::-1]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "queueDepth": self._queue.qsize() if self.started else 0,
+            "running": self.running,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "avgDuration": sum(self.durations) / len(self.durations) if self.durations else 0,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        self.running += 1
+        start = time.perf_counter()
+        try:
+            await job.func(*job.args)
+            job.status = JobStatus.SUCCEEDED
+            job.finished_at = time.time()
+            self.succeeded += 1
+        except Exception as e:
+            job.error = str(e)
+            if job.attempts < self.max_attempts:
+                job.status = JobStatus.RETRYING
+                self.retried += 1
+                delay = self.retry_delay * 2 ** (job.attempts - 1)
+                asyncio.get_running_loop().call_later(delay, self._requeue, job)
+            else:
+                job.status = JobStatus.FAILED
+                job.finished_at = time.time()
+                self.failed += 1
+                logger.error("Job %s (%s) failed after %d attempts: %s", job.id, job.name, job.attempts, e)
+        finally:
+            self.running -= 1
+            self.durations.append(time.perf_counter() - start)
+
+    def _requeue(self, job: Job) -> None:
+        if not self.started:
+            return
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            job.status = JobStatus.FAILED
+            job.finished_at = time.time()
+            self.failed += 1
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history_size:
+            self._jobs.popitem(last=False)
+
+
+job_queue = JobQueue(
+    workers=settings.JOB_QUEUE_WORKERS,
+    process_workers=settings.JOB_PROCESS_WORKERS,
+    max_size=settings.JOB_QUEUE_MAX_SIZE,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_delay=settings.JOB_RETRY_DELAY_SECONDS,
+)
@@ -0,0 +1,161 @@
+import gzip
+import io
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Media that is already compressed or must not be buffered
+SKIPPED_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/octet-stream",
+    "font/woff2",
+    "text/event-stream",
+)
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self.buffer = io.BytesIO()
+        self.file = gzip.GzipFile(mode="wb", fileobj=self.buffer, compresslevel=level)
+
+    def compress(self, data: bytes) -> bytes:
+        self.file.write(data)
+        return self._drain()
+
+    def finish(self) -> bytes:
+        self.file.close()
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip depending on Accept-Encoding"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def _choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _new_compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.app_send = send
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the start message until we know whether the body gets compressed
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or content_type.startswith(SKIPPED_CONTENT_TYPES)
+            )
+            return
+
+        if message_type != "http.response.body":
+            await self.app_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            await self._send_start()
+            await self.app_send(message)
+            return
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # Small single-chunk responses are not worth compressing
+                self.passthrough = True
+                await self._send_start()
+                await self.app_send(message)
+                return
+
+            self.compressor = self.middleware._new_compressor(self.encoding)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await self._send_start()
+                await self.app_send({"type": "http.response.body", "body": self.compressor.compress(body), "more_body": True})
+            else:
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send_start()
+                await self.app_send({"type": "http.response.body", "body": compressed})
+            return
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.app_send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_start(self) -> None:
+        if self.start_message is not None:
+            await self.app_send(self.start_message)
+            self.start_message = None
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+import random
+import threading
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.profiling import StackSampler, append_profile
+
+logger = logging.getLogger(__name__)
+
+class ProfilingMiddleware:
+    """Samples a fraction of requests (or those sending the debug header) with a stack sampler.
+
+    Only one request per process is profiled at a time, the event loop thread is
+    shared so concurrent requests would blur each other's stacks. The middleware is
+    only installed when PROFILING_ENABLED is set, so it costs nothing when off.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float, interval: float, output_dir: str, header: str):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.output_dir = output_dir
+        self.header = header.lower()
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            self._busy.release()
+            route = scope.get("route")
+            route_path = getattr(route, "path", scope["path"])
+            if sampler.samples:
+                path = await asyncio.get_running_loop().run_in_executor(
+                    None, append_profile, self.output_dir, f"{scope['method']} {route_path}", sampler.collapsed()
+                )
+                logger.info("Profiled %s %s: %d samples written to %s", scope["method"], route_path, sampler.samples, path)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if Headers(scope=scope).get(self.header):
+            return True
+        return random.random() < self.sample_rate
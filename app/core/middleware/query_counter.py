@@ -0,0 +1,52 @@
+import logging
+from typing import Dict
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.query_counter import query_metrics, start_counting, stop_counting
+
+logger = logging.getLogger(__name__)
+
+class QueryCounterMiddleware:
+    """Counts SQL statements per request and flags requests over the route's budget.
+
+    A request is also flagged when one statement is repeated `repeat_threshold`
+    times, which is what an N+1 loop over posts looks like.
+    """
+
+    def __init__(self, app: ASGIApp, default_budget: int, budgets: Dict[str, int], repeat_threshold: int):
+        self.app = app
+        self.default_budget = default_budget
+        self.budgets = budgets
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_counting()
+
+        async def send_with_count(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Query-Count", str(stats.count))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            stop_counting(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                self._check(f"{scope['method']} {route}", stats)
+
+    def _check(self, route: str, stats) -> None:
+        budget = self.budgets.get(route, self.default_budget)
+        over_budget = stats.count > budget
+        repeated = stats.repeated(self.repeat_threshold)
+        if over_budget:
+            logger.warning(
+                "%s executed %d queries (budget %d) in %.1f ms", route, stats.count, budget, stats.duration * 1000
+            )
+        for statement, count in repeated:
+            logger.warning("Possible N+1 in %s: %dx %s", route, count, " ".join(statement.split())[:200])
+        query_metrics.record(route, stats, over_budget, bool(repeated))
@@ -0,0 +1,71 @@
+import logging
+import math
+from typing import Optional
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.rate_limit import RateLimiter
+from app.core.services.jwt_service import JWTService
+
+logger = logging.getLogger(__name__)
+
+class RateLimitMiddleware:
+    """Rejects requests over their route's policy with 429 and Retry-After.
+
+    Runs before routing, so a rejected request never reaches the database or a
+    password hash. The user id is read from the access token signature alone,
+    without loading the user; requests without a valid token are limited per IP.
+    A failing backend lets requests through rather than taking the API down.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter, trust_forwarded: bool = False):
+        self.app = app
+        self.limiter = limiter
+        self.trust_forwarded = trust_forwarded
+        self.jwt_service = JWTService()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        policies = self.limiter.match(scope["method"], scope["path"], scope.get("query_string", b""))
+        if not policies:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        user_id = self._user_id(headers) if any(policy.scope == "user" for _, policy in policies) else None
+        try:
+            rejected = await self.limiter.check(policies, self._client_ip(scope, headers), user_id)
+        except Exception as e:
+            self.limiter.errors += 1
+            logger.error("Rate limit check failed, letting the request through: %s", e)
+            rejected = None
+
+        if rejected is None:
+            await self.app(scope, receive, send)
+            return
+
+        _, retry_after = rejected
+        response = JSONResponse(
+            status_code=429,
+            content={"errors": ["Too many requests, try again later"]},
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        await response(scope, receive, send)
+
+    def _client_ip(self, scope: Scope, headers: Headers) -> str:
+        if self.trust_forwarded:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",", 1)[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _user_id(self, headers: Headers) -> Optional[int]:
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        claims = self.jwt_service.verify_token(token)
+        return claims.get("id") if claims else None
@@ -0,0 +1,39 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.tracing import end_trace, phase_histograms, start_trace
+
+class ServerTimingMiddleware:
+    """Attaches a span trace to every request.
+
+    Phase durations collected until the response starts are sent in the
+    Server-Timing header, the full trace is aggregated into per-route histograms.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace, token = start_trace()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_trace(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None)
+            # Unmatched paths are not aggregated to keep the histogram keys bounded
+            if route_path is not None:
+                phase_histograms.record(
+                    f"{scope['method']} {route_path}", trace, time.perf_counter() - trace.started
+                )
@@ -0,0 +1,22 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.startup_profiler import startup_timeline
+
+class StartupTimingMiddleware:
+    """Marks the time to the first answered request, then only passes requests through"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.first_request_done = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.first_request_done or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                self.first_request_done = True
+                startup_timeline.mark("first_request")
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,58 @@
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+
+class StackSampler:
+    """Statistical profiler sampling the stack of one thread from a background thread.
+
+    Stacks are collected in collapsed format ("outer;inner;leaf count"), which
+    flamegraph.pl, speedscope and inferno read directly.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+
+def append_profile(output_dir: str, route: str, collapsed: str) -> str:
+    """Append collapsed stacks to the per-route profile file, stacks of repeated runs add up"""
+    os.makedirs(output_dir, exist_ok=True)
+    slug = route.replace(" ", "_").replace("/", "_").replace("{", "").replace("}", "").strip("_") or "root"
+    path = os.path.join(output_dir, f"{slug}.collapsed")
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(collapsed)
+    return path
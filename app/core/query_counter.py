@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryStats:
+    """Statements executed while serving one request (or inside `count_queries`).
+
+    Counting scopes nest: statements are also recorded in the enclosing scope, so a
+    test's `assert_max_queries` still sees the queries of a request the middleware counts.
+    """
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+        if self.parent is not None:
+            self.parent.record(statement, duration)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times, the usual shape of an N+1"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_counting() -> Tuple[QueryStats, Any]:
+    stats = QueryStats(parent=_current_stats.get())
+    return stats, _current_stats.set(stats)
+
+
+def stop_counting(token: Any) -> None:
+    _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Executions on one connection do not nest. A single slot also cannot grow when
+    # a failing statement skips after_cursor_execute, the next one overwrites it
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_start", None)
+    if started is None:
+        return
+    # The async engine runs these hooks in a greenlet sharing the awaiting task's context
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def install_query_counter(engine: AsyncEngine) -> None:
+    """Hook the counter into the engine's cursor events, safe to call more than once"""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def count_queries():
+    """Collect the statements executed inside the block"""
+    stats, token = start_counting()
+    try:
+        yield stats
+    finally:
+        stop_counting(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Test helper failing when the block executes more than `limit` statements.
+
+        with assert_max_queries(3):
+            response = await client.get("/api/v1/posts/get-posts-data")
+    """
+    with count_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        listing = "\n".join(f"  {count}x {statement}" for statement, count in stats.statements.most_common())
+        raise AssertionError(f"Expected at most {limit} queries, {stats.count} were executed:\n{listing}")
+
+
+class QueryMetrics:
+    """Per-route statement counts and budget violations"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, route: str, stats: QueryStats, over_budget: bool, repeated: bool) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(
+                route, {"requests": 0, "queries": 0, "maxQueries": 0, "dbTime": 0.0, "overBudget": 0, "repeatedQueries": 0}
+            )
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["maxQueries"] = max(entry["maxQueries"], stats.count)
+            entry["dbTime"] += stats.duration
+            entry["overBudget"] += int(over_budget)
+            entry["repeatedQueries"] += int(repeated)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                route: {
+                    "requests": entry["requests"],
+                    "avgQueries": round(entry["queries"] / entry["requests"], 2),
+                    "maxQueries": entry["maxQueries"],
+                    "avgDbTimeMs": round(entry["dbTime"] * 1000 / entry["requests"], 3),
+                    "overBudget": entry["overBudget"],
+                    "repeatedQueries": entry["repeatedQueries"],
+                }
+                for route, entry in self._routes.items()
+            }
+
+
+query_metrics = QueryMetrics()
@@ -0,0 +1,261 @@
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl
+from app.core.config.config import settings
+
+SCOPES = ("ip", "user")
+
+_PATH_PARAM = re.compile(r"\{[^/}]+\}")
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Token bucket of `capacity` requests refilled over `period` seconds, per client"""
+
+    scope: str
+    capacity: int
+    period: float
+    query_param: Optional[str] = None
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, spec: str, query_param: Optional[str] = None) -> "RateLimitPolicy":
+        """Parses "<scope>:<requests>/<seconds>", e.g. "ip:10/60" """
+        try:
+            scope, rate = spec.split(":", 1)
+            requests, seconds = rate.split("/", 1)
+            policy = cls(scope.strip(), int(requests), float(seconds), query_param)
+        except ValueError:
+            raise ValueError(f"Invalid rate limit policy: {spec!r}") from None
+        if policy.scope not in SCOPES or policy.capacity <= 0 or policy.period <= 0:
+            raise ValueError(f"Invalid rate limit policy: {spec!r}")
+        return policy
+
+
+def refill(tokens: float, elapsed: float, capacity: int, rate: float) -> float:
+    """Tokens in a bucket `elapsed` seconds after it held `tokens`"""
+    return min(capacity, tokens + max(0.0, elapsed) * rate)
+
+
+def wait_for(tokens: float, rate: float, cost: float) -> float:
+    """Seconds until the bucket holds `cost` tokens, 0 when it already does"""
+    return 0.0 if tokens >= cost else (cost - tokens) / rate
+
+
+# (key, capacity, refill rate) of one bucket
+Bucket = Tuple[str, int, float]
+
+
+class RateLimitBackend(ABC):
+    name: str
+
+    @abstractmethod
+    async def acquire(self, buckets: List[Bucket], cost: float = 1.0) -> List[float]:
+        """Takes `cost` tokens from every bucket, or from none of them when one is short.
+
+        Returns the seconds each bucket needs until it would allow the request, all 0 when allowed.
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Buckets in a dict of this process, a check is one lookup and a lazy refill per bucket.
+
+    The least recently used buckets are dropped past `max_keys`. A dropped bucket
+    starts full again, so eviction can only let a request through, never block one.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    async def acquire(self, buckets: List[Bucket], cost: float = 1.0) -> List[float]:
+        # Nothing here awaits, so the read-modify-write cannot interleave with another request
+        now = time.monotonic()
+        states = [self._refilled(key, capacity, rate, now) for key, capacity, rate in buckets]
+        waits = [wait_for(state[0], rate, cost) for state, (_, _, rate) in zip(states, buckets)]
+        if not any(waits):
+            for state in states:
+                state[0] -= cost
+        return waits
+
+    def _refilled(self, key: str, capacity: int, rate: float, now: float) -> List[float]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(capacity), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = refill(bucket[0], now - bucket[1], capacity, rate)
+            bucket[1] = now
+        return bucket
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """Buckets in a SQLite file shared by every worker process on the host.
+
+    Stand-in for a shared store such as Redis: a check is one short write
+    transaction in the default executor, far slower than the memory backend, but
+    the limits hold across workers. Rows of buckets that have refilled completely
+    are pruned every `prune_every` checks.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, prune_every: int = 1000):
+        self.path = path
+        self.prune_every = prune_every
+        self._checks = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, full_at REAL NOT NULL)"
+        )
+
+    async def acquire(self, buckets: List[Bucket], cost: float = 1.0) -> List[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._acquire, buckets, cost)
+
+    def _acquire(self, buckets: List[Bucket], cost: float) -> List[float]:
+        # Wall clock, monotonic clocks are not comparable between processes
+        now = time.time()
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                tokens = []
+                for key, capacity, rate in buckets:
+                    row = connection.execute(
+                        "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+                    ).fetchone()
+                    tokens.append(float(capacity) if row is None else refill(row[0], now - row[1], capacity, rate))
+                waits = [wait_for(left, rate, cost) for left, (_, _, rate) in zip(tokens, buckets)]
+                if not any(waits):
+                    tokens = [left - cost for left in tokens]
+                connection.executemany(
+                    "INSERT INTO rate_limit_buckets (key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, "
+                    "updated_at = excluded.updated_at, full_at = excluded.full_at",
+                    [
+                        (key, left, now, now + (capacity - left) / rate)
+                        for left, (key, capacity, rate) in zip(tokens, buckets)
+                    ],
+                )
+                self._checks += 1
+                if self._checks % self.prune_every == 0:
+                    connection.execute("DELETE FROM rate_limit_buckets WHERE full_at < ?", (now,))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return waits
+
+
+class RateLimiter:
+    """Matches requests to route policies and checks their buckets in the backend.
+
+    Policies are keyed like the query budgets, "METHOD /route/path", with path
+    parameters written as in the route ("{post_id}"). A "?param" suffix applies the
+    policy only to requests carrying that query parameter. Static paths are a dict
+    lookup, only the few templated ones are matched by regex. Each policy has its
+    own buckets, keyed by client IP or by the user id from the access token.
+    """
+
+    def __init__(self, backend: RateLimitBackend, policies: Dict[str, str], default: Optional[str] = None):
+        self.backend = backend
+        self.default = RateLimitPolicy.parse(default) if default else None
+        self._static: Dict[Tuple[str, str], List[Tuple[str, RateLimitPolicy]]] = {}
+        self._templated: List[Tuple[str, Pattern, str, RateLimitPolicy]] = []
+        self.allowed: Dict[str, int] = {}
+        self.limited: Dict[str, int] = {}
+        self.errors = 0
+
+        for name, spec in policies.items():
+            method, _, target = name.partition(" ")
+            path, _, query_param = target.partition("?")
+            policy = RateLimitPolicy.parse(spec, query_param or None)
+            if _PATH_PARAM.search(path):
+                pattern = re.compile("^" + "[^/]+".join(re.escape(part) for part in _PATH_PARAM.split(path)) + "$")
+                self._templated.append((method.upper(), pattern, name, policy))
+            else:
+                self._static.setdefault((method.upper(), path), []).append((name, policy))
+
+    def match(self, method: str, path: str, query_string: bytes) -> List[Tuple[str, RateLimitPolicy]]:
+        matched = self._static.get((method, path))
+        if matched is None:
+            matched = [
+                (name, policy) for route_method, pattern, name, policy in self._templated
+                if route_method == method and pattern.match(path)
+            ]
+        if any(policy.query_param for _, policy in matched):
+            params = {key for key, value in parse_qsl(query_string.decode("latin-1")) if value}
+            matched = [(name, policy) for name, policy in matched if not policy.query_param or policy.query_param in params]
+        if not matched and self.default is not None:
+            matched = [("default", self.default)]
+        return matched
+
+    async def check(
+        self, policies: List[Tuple[str, RateLimitPolicy]], client_ip: str, user_id: Optional[int]
+    ) -> Optional[Tuple[str, float]]:
+        """Limiting policy and its wait in seconds, or None when the request may go on.
+
+        Every policy's bucket is checked before any is charged, a request rejected by
+        one policy does not use up the others.
+        """
+        buckets = []
+        for name, policy in policies:
+            # Requests without a valid token share the per-IP bucket of the policy
+            client = f"user:{user_id}" if policy.scope == "user" and user_id is not None else f"ip:{client_ip}"
+            buckets.append((f"{name}|{client}", policy.capacity, policy.refill_rate))
+        waits = await self.backend.acquire(buckets)
+        if any(waits):
+            # The longest wait is the one the client has to sit out
+            index = max(range(len(waits)), key=waits.__getitem__)
+            name = policies[index][0]
+            self.limited[name] = self.limited.get(name, 0) + 1
+            return name, waits[index]
+        for name, _ in policies:
+            self.allowed[name] = self.allowed.get(name, 0) + 1
+        return None
+
+    def get_metrics(self) -> Dict[str, object]:
+        return {
+            "backend": self.backend.name,
+            "errors": self.errors,
+            "policies": {
+                name: {"allowed": self.allowed.get(name, 0), "limited": self.limited.get(name, 0)}
+                for name in sorted(set(self.allowed) | set(self.limited))
+            },
+        }
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    """Rate limiter selected by RATE_LIMIT_BACKEND, shared by the whole process"""
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        backend = MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+    elif settings.RATE_LIMIT_BACKEND == "sqlite":
+        backend = SQLiteRateLimitBackend(settings.RATE_LIMIT_SQLITE_PATH)
+    else:
+        raise RuntimeError(f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND}")
+    return RateLimiter(backend, settings.RATE_LIMIT_POLICIES, settings.RATE_LIMIT_DEFAULT)
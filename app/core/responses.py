@@ -0,0 +1,19 @@
+from typing import Any
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+from app.core.tracing import span
+
+
+class ORJSONModelResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Pydantic models are dumped to python objects and serialized by orjson directly,
+    bypassing FastAPI's jsonable_encoder pass over large page payloads.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            if isinstance(content, BaseModel):
+                content = content.model_dump()
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,59 @@
+import logging
+import os
+from functools import lru_cache
+from typing import FrozenSet
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "alembic.ini")
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+@lru_cache()
+def get_expected_heads() -> FrozenSet[str]:
+    """Head revisions of the migration scripts, read from disk without a database"""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+    return frozenset(ScriptDirectory.from_config(config).get_heads())
+
+
+async def get_current_revisions(engine: AsyncEngine) -> FrozenSet[str]:
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError:
+            # alembic_version does not exist, the database was never migrated
+            return frozenset()
+        return frozenset(result.scalars().all())
+
+
+async def check_schema_version(engine: AsyncEngine, mode: str) -> None:
+    """Compare alembic_version with the migration heads.
+
+    Migrations are applied out of band with `alembic upgrade head`, so startup
+    only runs this single query instead of inspecting every table.
+    """
+    if mode == "off":
+        return
+
+    expected = get_expected_heads()
+    current = await get_current_revisions(engine)
+    if current == expected:
+        return
+
+    message = (
+        f"Database schema is at {sorted(current) or 'no revision'}, "
+        f"the application expects {sorted(expected)}. Run `alembic upgrade head`."
+    )
+    if mode == "strict":
+        raise SchemaVersionError(message)
+    logger.warning(message)
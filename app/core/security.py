@@ -1,23 +1,30 @@
-import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
 from typing import Optional
 from app.core.config.config import get_settings
+from app.core.tracing import traced
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=10, bcrypt__ident="2a")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/sign-in")
 
+@lru_cache()
+def get_pwd_context():
+    # passlib and bcrypt are imported on first use to keep them out of application startup
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=10, bcrypt__ident="2a")
+
+@traced("password")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
+@traced("password")
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict) -> str:
+    from jose import jwt
     to_encode = data.copy()
     return jwt.encode(to_encode, settings.TOKEN_SIGNING_KEY, algorithm="HS256")
 
@@ -27,6 +34,7 @@ def verify_token(token: str = Depends(oauth2_scheme)) -> Optional[dict]:
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, settings.TOKEN_SIGNING_KEY, algorithms=["HS256"])
         return payload
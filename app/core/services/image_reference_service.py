@@ -0,0 +1,86 @@
+from fastapi import HTTPException, status
+from collections import Counter
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from app.models.stored_object import StoredObject
+from ..images import has_renditions
+
+# Advisory lock key shared by uploads (shared mode) and storage GC deletions (exclusive mode)
+STORAGE_GC_LOCK_KEY = 0x696D67
+
+class ImageReferenceService:
+    """Reference counting of content-addressed images.
+
+    Changes are flushed with the caller's session and committed together with the
+    row that takes or drops the reference.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def lock_for_upload(self) -> None:
+        """Hold storage GC deletions off until the caller's transaction ends.
+
+        Taken before the upload's dedup check, so an existing object the upload
+        reuses cannot be deleted before the reference to it is committed.
+        """
+        await self.db.execute(select(func.pg_advisory_xact_lock_shared(STORAGE_GC_LOCK_KEY)))
+
+    async def acquire(self, object_name: str) -> None:
+        if not has_renditions(object_name):
+            return
+        try:
+            stmt = insert(StoredObject).values(object_name=object_name, ref_count=1)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[StoredObject.object_name],
+                set_={"ref_count": StoredObject.ref_count + 1}
+            )
+            await self.db.execute(stmt)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error acquiring image reference: {str(e)}"
+            )
+
+    async def acquire_many(self, object_names: List[str]) -> None:
+        """Take one reference per entry with a single upsert, repeated names are counted together"""
+        counts = Counter(name for name in object_names if has_renditions(name))
+        if not counts:
+            return
+        try:
+            stmt = insert(StoredObject).values([
+                {"object_name": name, "ref_count": count} for name, count in counts.items()
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[StoredObject.object_name],
+                set_={"ref_count": StoredObject.ref_count + stmt.excluded.ref_count}
+            )
+            await self.db.execute(stmt)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error acquiring image references: {str(e)}"
+            )
+
+    async def release(self, object_name: Optional[str]) -> None:
+        if not object_name or not has_renditions(object_name):
+            return
+        try:
+            stmt = update(StoredObject).where(
+                StoredObject.object_name == object_name,
+                StoredObject.ref_count > 0
+            ).values(ref_count=StoredObject.ref_count - 1)
+            await self.db.execute(stmt)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error releasing image reference: {str(e)}"
+            )
+
+    async def replace(self, old_object_name: Optional[str], new_object_name: str) -> None:
+        if old_object_name == new_object_name:
+            return
+        await self.acquire(new_object_name)
+        await self.release(old_object_name)
@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from jose import jwt
 from app.core.config.config import get_settings
 
 settings = get_settings()
@@ -37,6 +36,7 @@ class JWTService:
             "iat": datetime.utcnow(),
             "exp": datetime.utcnow() + timedelta(minutes=self.access_token_expiration)
         })
+        from jose import jwt
         return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
 
     def is_token_expired(self, token: str) -> bool:
@@ -46,6 +46,7 @@ class JWTService:
         return datetime.fromtimestamp(expiration) < datetime.utcnow()
 
     def extract_all_claims(self, token: str) -> Dict[str, Any]:
+        from jose import jwt
         return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
 
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
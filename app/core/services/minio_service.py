@@ -1,107 +1,278 @@
-from minio import Minio
-from minio.error import S3Error
 from fastapi import UploadFile
-from typing import Optional
+from typing import BinaryIO, Optional, Sequence
+from functools import partial
+import asyncio
 import base64
-import io
-import uuid
-from urllib.parse import urlparse
+import hashlib
+import logging
 from app.core.config.config import settings
+from app.core.exceptions import BadRequestException
+from app.core.images import has_renditions, rendition_name, render_image, RENDITIONS
+from app.core.job_queue import job_queue
+from app.models.enums import ImageResponseMode
+from app.core.storage.base import StorageBackend, StorageError
+from app.core.storage.cache import TieredImageCache
+from app.core.storage.factory import get_storage_backend, get_image_cache
+from app.core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+LAST_RENDITION = list(RENDITIONS)[-1]
+
+
+class FileTooLargeError(Exception):
+    pass
+
+
+class _SizeLimitedReader:
+    """File wrapper that fails as soon as more than `max_size` bytes were read"""
+
+    def __init__(self, file: BinaryIO, max_size: int):
+        self.file = file
+        self.max_size = max_size
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.file.read(size)
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.max_size:
+            raise FileTooLargeError(f"File exceeds the maximum size of {self.max_size} bytes")
+        return chunk
+
 
 class MinioService:
-    def __init__(self):
-        # Parse the URL to get just the host and port
-        parsed_url = urlparse(settings.MINIO_URL)
-        endpoint = f"{parsed_url.hostname}:{parsed_url.port}"
-        
-        self.client = Minio(
-            endpoint=endpoint,
-            access_key=settings.MINIO_ACCESS_KEY,
-            secret_key=settings.MINIO_SECRET_KEY,
-            secure=False
+    """Image storage operations on top of the configured storage backend.
+
+    The name is historical, MinIO is the default backend but the local disk
+    backend can be selected with STORAGE_BACKEND.
+    """
+
+    def __init__(self, storage: Optional[StorageBackend] = None, cache: Optional[TieredImageCache] = None):
+        self.storage = storage or get_storage_backend()
+        self.cache = cache or get_image_cache()
+
+    @traced("storage")
+    async def upload_file(self, file: UploadFile, keep_in_cache: bool = False) -> str:
+        """Upload a file to MinIO.
+
+        With `keep_in_cache` the uploaded bytes are also put in the image cache, so a
+        response echoing the image does not read it back from storage.
+        """
+        try:
+            file_name = self._generate_file_name(file.filename, await self._hash_file(file))
+            is_image = bool(file.content_type and file.content_type.startswith("image/"))
+            # Content-addressed names are immutable, an existing object already has the same bytes
+            if await self.file_exists(file_name):
+                # Marks the object as in use for the storage GC grace period, and retries
+                # renditions that an earlier job failed to store
+                await self.touch_file(file_name)
+                if is_image and not await self.renditions_ready(file_name):
+                    await self._schedule_renditions(file_name)
+            else:
+                await self._put_stream(file_name, file)
+                if is_image:
+                    await self._schedule_renditions(file_name)
+
+            if keep_in_cache:
+                await asyncio.get_running_loop().run_in_executor(None, self._cache_upload, file_name, file)
+            return file_name
+        except FileTooLargeError as e:
+            raise BadRequestException(str(e))
+        except StorageError as e:
+            raise Exception(str(e))
+
+    def _cache_upload(self, file_name: str, file: UploadFile) -> None:
+        """Copy the spooled upload into the image cache, runs in a worker thread"""
+        file.file.seek(0)
+        self.cache.put(file_name, file.file.read())
+
+    async def _hash_file(self, file: UploadFile) -> str:
+        """SHA-256 of the upload, read from its spool file in chunks"""
+        size = file.size if file.size is not None else -1
+        if size > settings.MAX_FILE_SIZE:
+            raise FileTooLargeError(f"File exceeds the maximum size of {settings.MAX_FILE_SIZE} bytes")
+
+        def digest() -> str:
+            file.file.seek(0)
+            reader = _SizeLimitedReader(file.file, settings.MAX_FILE_SIZE)
+            sha256 = hashlib.sha256()
+            for chunk in iter(lambda: reader.read(HASH_CHUNK_SIZE), b""):
+                sha256.update(chunk)
+            return sha256.hexdigest()
+
+        return await asyncio.get_running_loop().run_in_executor(None, digest)
+
+    async def _put_stream(self, object_name: str, file: UploadFile) -> None:
+        """Stream an upload from its spool file to MinIO chunk by chunk.
+
+        The size is enforced while reading, so at most one part is held in memory.
+        Uploads of unknown or large size go through a multipart put.
+        """
+        size = file.size if file.size is not None else -1
+        if size > settings.MAX_FILE_SIZE:
+            raise FileTooLargeError(f"File exceeds the maximum size of {settings.MAX_FILE_SIZE} bytes")
+
+        await file.seek(0)
+        reader = _SizeLimitedReader(file.file, settings.MAX_FILE_SIZE)
+        put = partial(
+            self.storage.put_stream,
+            object_name,
+            reader,
+            size,
+            file.content_type or "application/octet-stream",
+            settings.UPLOAD_PART_SIZE
         )
-        self.bucket_name = settings.MINIO_BUCKET
+        await asyncio.get_running_loop().run_in_executor(None, put)
 
-    async def upload_file(self, file: UploadFile) -> str:
-        """Upload a file to MinIO"""
+    @traced("storage")
+    async def upload_renditions(self, file_name: str) -> None:
+        """Store the derived renditions of an image next to the original"""
+        file_content = await self.get_file(file_name)
+        if not file_content:
+            raise Exception(f"Original image {file_name} not found")
         try:
-            file_name = self._generate_file_name(file.filename)
-            file_content = await file.read()
-            
-            self.client.put_object(
-                bucket_name=self.bucket_name,
-                object_name=file_name,
-                data=io.BytesIO(file_content),
-                length=len(file_content),
-                content_type=file.content_type
+            renditions = await job_queue.run_cpu(render_image, file_content)
+        except OSError as e:
+            # Undecodable images (PIL.UnidentifiedImageError is an OSError) are still served from the original
+            logger.warning("Skipping renditions for %s: %s", file_name, e)
+            return
+
+        loop = asyncio.get_running_loop()
+        for rendition, data in renditions.items():
+            object_name = rendition_name(file_name, rendition)
+            await loop.run_in_executor(
+                None, self.storage.put_bytes, object_name, data, RENDITIONS[rendition].content_type
             )
-            
-            return file_name
-        except S3Error as e:
-            raise Exception(f"Error uploading file to MinIO: {str(e)}")
+            # Replaces a cached miss recorded while the rendition was pending
+            await loop.run_in_executor(None, self.cache.put, object_name, data)
+
+    async def _schedule_renditions(self, file_name: str) -> None:
+        """Generate renditions in the background, the original is served until they appear"""
+        if not job_queue.started:
+            # Outside the application lifespan (scripts, shells) there are no workers
+            await self.upload_renditions(file_name)
+            return
+        try:
+            job_queue.submit("renditions", self.upload_renditions, file_name)
+        except asyncio.QueueFull:
+            logger.warning("Job queue is full, skipping renditions for %s", file_name)
+
+    async def renditions_ready(self, file_name: str) -> bool:
+        """Whether the renditions of an image are stored, they are written in RENDITIONS order.
+
+        Answered from the cache when possible, a pending rendition is checked in
+        storage again once its recorded miss expires.
+        """
+        if not has_renditions(file_name):
+            return True
+        object_name = rendition_name(file_name, LAST_RENDITION)
+        if self.cache.is_known_present(object_name):
+            return True
+        if self.cache.is_known_miss(object_name):
+            return False
+        ready = await self.file_exists(object_name)
+        if ready:
+            self.cache.record_present(object_name)
+        else:
+            self.cache.record_miss(object_name)
+        return ready
 
+    @traced("storage")
     async def get_file(self, file_name: str) -> Optional[bytes]:
-        """Get a file from MinIO"""
+        """Get a file through the memory and disk caches, falling back to storage"""
+        file_content = self.cache.get_from_memory(file_name)
+        if file_content is not None:
+            return file_content
+        if self.cache.is_known_miss(file_name):
+            return None
+        return await asyncio.get_running_loop().run_in_executor(None, self._load_file, file_name)
+
+    def _load_file(self, file_name: str) -> Optional[bytes]:
+        """Disk cache then storage lookup, runs in a worker thread"""
+        file_content = self.cache.get_from_disk(file_name)
+        if file_content is not None:
+            return file_content
         try:
-            response = self.client.get_object(
-                bucket_name=self.bucket_name,
-                object_name=file_name
-            )
-            return response.read()
-        except S3Error:
+            file_content = self.storage.get(file_name)
+        except StorageError:
             return None
-        finally:
-            response.close()
-            response.release_conn()
+        if file_content is None:
+            self.cache.record_miss(file_name)
+        else:
+            self.cache.put(file_name, file_content)
+        return file_content
 
-    async def get_file_as_base64(self, file_name: str) -> str:
-        """Get a file from MinIO as base64 string"""
-        file_content = await self.get_file(file_name)
+    @traced("storage")
+    async def get_file_as_base64(self, file_name: str, renditions: Sequence[str] = ()) -> str:
+        """Get a file from MinIO as base64 string.
+
+        The first available rendition is used, falling back to the original.
+        """
+        file_content = None
+        if has_renditions(file_name):
+            for rendition in renditions:
+                file_content = await self.get_file(rendition_name(file_name, rendition))
+                if file_content:
+                    file_name = rendition_name(file_name, rendition)
+                    break
+        if not file_content:
+            file_content = await self.get_file(file_name)
         if not file_content:
             return ""
         
-        content_type = self._get_content_type(file_name)
+        content_type = self.get_content_type(file_name)
         base64_content = base64.b64encode(file_content).decode('utf-8')
         return f"data:{content_type};base64,{base64_content}"
 
+    async def get_response_image(self, file_name: str, renditions: Sequence[str], image_mode: ImageResponseMode) -> str:
+        """Image field of a response, either the image URL or the base64 data"""
+        if image_mode == ImageResponseMode.URL:
+            return self.get_file_url(file_name)
+        return await self.get_file_as_base64(file_name, renditions)
+
+    @traced("storage")
     async def delete_file(self, file_name: str) -> None:
-        """Delete a file from MinIO"""
+        """Delete a file from storage"""
+        self.cache.invalidate(file_name)
         try:
-            self.client.remove_object(
-                bucket_name=self.bucket_name,
-                object_name=file_name
-            )
-        except S3Error as e:
-            raise Exception(f"Error deleting file from MinIO: {str(e)}")
+            await asyncio.get_running_loop().run_in_executor(None, self.storage.delete, file_name)
+        except StorageError as e:
+            raise Exception(str(e))
+
+    @traced("storage")
+    async def touch_file(self, file_name: str) -> None:
+        """Refresh the last modified time of a stored file"""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.storage.touch, file_name)
+        except StorageError as e:
+            raise Exception(str(e))
 
+    @traced("storage")
     async def file_exists(self, file_name: str) -> bool:
-        """Check if a file exists in MinIO"""
+        """Check if a file exists in storage"""
         try:
-            self.client.stat_object(
-                bucket_name=self.bucket_name,
-                object_name=file_name
-            )
-            return True
-        except S3Error as e:
-            if e.code == "NoSuchKey":
-                return False
-            raise Exception(f"Error checking file existence in MinIO: {str(e)}")
+            return await asyncio.get_running_loop().run_in_executor(None, self.storage.exists, file_name)
+        except StorageError as e:
+            raise Exception(str(e))
 
     def get_file_url(self, file_name: str) -> str:
-        """Get the URL for a file in MinIO"""
-        return f"{settings.MINIO_ENDPOINT}/{self.bucket_name}/{file_name}"
+        """Get the URL the image endpoint serves a file from"""
+        return f"{settings.API_V1_STR}/images/{file_name}"
 
-    def _generate_file_name(self, original_name: str) -> str:
-        """Generate a unique file name"""
-        return f"{uuid.uuid4()}-{original_name}"
+    def _generate_file_name(self, original_name: Optional[str], content_hash: str) -> str:
+        """Generate a content-addressed file name keeping the original extension"""
+        ext = original_name.rsplit('.', 1)[-1].lower() if original_name and '.' in original_name else ''
+        return f"{content_hash}.{ext}" if ext else content_hash
 
-    def _get_content_type(self, file_name: str) -> str:
+    def get_content_type(self, file_name: str) -> str:
         """Get content type based on file extension"""
         ext = file_name.split('.')[-1].lower()
         content_types = {
             'jpg': 'image/jpeg',
             'jpeg': 'image/jpeg',
             'png': 'image/png',
-            'gif': 'image/gif'
+            'gif': 'image/gif',
+            'webp': 'image/webp'
         }
         return content_types.get(ext, 'application/octet-stream') 
\ No newline at end of file
@@ -1,8 +1,15 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from app.core.config.config import settings
 from app.core.services.minio_service import MinioService
 from app.models.enums import PostStatus
+from app.models.post import Post
+from app.schemas.post import PostResponse, ModerationClaimResponse, ModerationDecisionRequest, ModerationDecisionResponse
 from .user_service import UserService
 from .post_service import PostService
 from ..exceptions import ResourceNotFoundException, UnauthorizedException, BadRequestException
+from ..images import FEED_RENDITIONS
+from ..event_bus import event_bus, LifecycleEvent, PostEventType
 
 class ModeratorService(UserService):
     def __init__(self, db, post_service: PostService, minio_service: MinioService):
@@ -16,14 +23,134 @@ class ModeratorService(UserService):
         if current_user.role != "ROLE_MODERATOR":
             raise UnauthorizedException("Only moderators can make decisions on posts")
 
+        # Locked until the decision commits, a concurrent claim skips the row instead of racing it
+        await self.db.refresh(post, with_for_update=True)
         if post.status != PostStatus.STATUS_NOT_CHECKED:
             raise BadRequestException("Can only make decisions on pending posts")
 
+        if post.claimed_by not in (None, current_user.id) and post.claimed_until >= datetime.utcnow():
+            raise BadRequestException("Post is claimed by another moderator")
+
         if decision.lower() == "approved":
             post.status = PostStatus.STATUS_VERIFIED
+            event_type = PostEventType.APPROVED
         elif decision.lower() == "rejected":
             post.status = PostStatus.STATUS_DENIED
+            event_type = PostEventType.REJECTED
         else:
             raise BadRequestException("Invalid decision. Must be either 'approved' or 'rejected'")
 
-        await self.post_service.save(post) 
\ No newline at end of file
+        post.claimed_by = None
+        post.claimed_until = None
+        await self.post_service.save(post)
+        await event_bus.publish(LifecycleEvent(event_type, post.id, current_user.id, {"authorId": post.author_id}))
+
+    async def claim_posts(self, current_user, limit: int) -> ModerationClaimResponse:
+        """Lease a batch of pending posts to the moderator.
+
+        Rows locked by a concurrent claim are skipped instead of waited on, and posts
+        whose lease expired go back to the queue, so moderators never get the same post.
+        The moderator's own unexpired claims are returned again.
+        """
+        if current_user.role != "ROLE_MODERATOR":
+            raise UnauthorizedException("Only moderators can claim posts")
+
+        now = datetime.utcnow()
+        lease_expires_at = now + timedelta(seconds=settings.MODERATION_LEASE_SECONDS)
+        claimable = (
+            select(Post.id)
+            .where(
+                Post.status == PostStatus.STATUS_NOT_CHECKED,
+                (Post.claimed_until.is_(None)) | (Post.claimed_until < now) | (Post.claimed_by == current_user.id)
+            )
+            .order_by(Post.date)
+            .limit(min(limit, settings.MODERATION_CLAIM_MAX))
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(Post)
+            .where(Post.id.in_(claimable.scalar_subquery()))
+            .values(claimed_by=current_user.id, claimed_until=lease_expires_at)
+            .returning(Post.id)
+            .execution_options(synchronize_session=False)
+        )
+        post_ids = list(result.scalars().all())
+        await self.db.commit()
+
+        posts = []
+        if post_ids:
+            result = await self.db.execute(select(Post).where(Post.id.in_(post_ids)).order_by(Post.date))
+            posts = result.scalars().all()
+
+        return ModerationClaimResponse(
+            posts=[
+                PostResponse(
+                    id=post.id,
+                    title=post.title,
+                    author=post.author.username,
+                    date=post.date,
+                    location=post.location,
+                    description=post.description,
+                    image=await self.minio_service.get_file_as_base64(post.image_name, FEED_RENDITIONS),
+                    likes=post.likes,
+                    isLiked=False,
+                    status=post.status
+                )
+                for post in posts
+            ],
+            leaseExpiresAt=lease_expires_at
+        )
+
+    async def decide_posts(self, current_user, request: ModerationDecisionRequest) -> ModerationDecisionResponse:
+        """Apply approve/reject decisions for many posts in one transaction.
+
+        Only posts still leased to this moderator are changed, the others are reported
+        as skipped, e.g. when the lease expired and another moderator took the post.
+        """
+        if current_user.role != "ROLE_MODERATOR":
+            raise UnauthorizedException("Only moderators can make decisions on posts")
+        if set(request.approved) & set(request.rejected):
+            raise BadRequestException("A post cannot be both approved and rejected")
+
+        now = datetime.utcnow()
+        decided = {}
+        try:
+            for decision, status, post_ids in (
+                ("approved", PostStatus.STATUS_VERIFIED, request.approved),
+                ("rejected", PostStatus.STATUS_DENIED, request.rejected)
+            ):
+                decided[decision] = []
+                if not post_ids:
+                    continue
+                result = await self.db.execute(
+                    update(Post)
+                    .where(
+                        Post.id.in_(post_ids),
+                        Post.status == PostStatus.STATUS_NOT_CHECKED,
+                        Post.claimed_by == current_user.id,
+                        Post.claimed_until >= now
+                    )
+                    .values(status=status, claimed_by=None, claimed_until=None)
+                    .returning(Post.id, Post.author_id)
+                    .execution_options(synchronize_session=False)
+                )
+                decided[decision] = [tuple(row) for row in result.all()]
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        await event_bus.publish_many([
+            LifecycleEvent(event_type, post_id, current_user.id, {"authorId": author_id, "bulk": True})
+            for event_type, decision in ((PostEventType.APPROVED, "approved"), (PostEventType.REJECTED, "rejected"))
+            for post_id, author_id in decided[decision]
+        ])
+
+        approved = [post_id for post_id, _ in decided["approved"]]
+        rejected = [post_id for post_id, _ in decided["rejected"]]
+        applied = set(approved) | set(rejected)
+        return ModerationDecisionResponse(
+            approved=approved,
+            rejected=rejected,
+            skipped=[post_id for post_id in [*request.approved, *request.rejected] if post_id not in applied]
+        )
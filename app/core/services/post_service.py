@@ -1,23 +1,36 @@
 from fastapi import HTTPException, status
-from typing import Optional, List
+from typing import AsyncIterator, Dict, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, asc
+from sqlalchemy import select, insert, and_, or_, desc, asc, Select
 from sqlalchemy.sql import func
+from sqlalchemy.orm import raiseload, selectinload
+import orjson
 from datetime import datetime
+import asyncio
+import logging
 from app.models.post import Post
-from app.models.user import User
-from app.models.enums import PostStatus, PostSort, Role
-from app.schemas.post import PostResponse, PostRequest, PageResponse
+from app.models.user import User, user_post_likes
+from app.models.enums import PostStatus, PostSort, Role, ImageResponseMode
+from app.schemas.post import PostResponse, PostRequest, PageResponse, BulkPostRequest, BulkPostCreated, BulkPostResponse
 from fastapi import UploadFile
 from .minio_service import MinioService
 from .user_service import UserService
-from ..exceptions import ResourceNotFoundException, UnauthorizedException, BadRequestException
+from .image_reference_service import ImageReferenceService
+from .storage_gc_service import StorageGarbageCollector
+from ..exceptions import ResourceNotFoundException, UnauthorizedException, BadRequestException, NotModifiedException
+from ..http_cache import make_weak_etag, etag_matches
+from ..event_bus import event_bus, LifecycleEvent, PostEventType
+from ..config.config import settings
+from ..images import DEFAULT_POST_IMAGE, FEED_RENDITIONS, DETAIL_RENDITIONS, RENDITIONS, rendition_name
+
+logger = logging.getLogger(__name__)
 
 class PostService:
     def __init__(self, db: AsyncSession, user_service: UserService, minio_service: MinioService):
         self.db = db
         self.user_service = user_service
         self.minio_service = minio_service
+        self.image_references = ImageReferenceService(db)
 
     async def save(self, post: Post) -> Post:
         try:
@@ -32,14 +45,19 @@ class PostService:
                 detail=f"Database error: {str(e)}"
             )
 
-    async def create_post(self, current_user, create_post_request: PostRequest, image_file: Optional[UploadFile] = None) -> PostResponse:
+    async def create_post(self, current_user, create_post_request: PostRequest, image_file: Optional[UploadFile] = None, image_mode: ImageResponseMode = ImageResponseMode.BASE64) -> PostResponse:
         try:
             if not current_user:
                 raise UnauthorizedException("User not authenticated")
 
-            image_name = "default-post-img.png"
+            image_name = DEFAULT_POST_IMAGE
+            renditions = DETAIL_RENDITIONS
             if image_file and image_file.filename:
-                image_name = await self.minio_service.upload_file(image_file)
+                await self.image_references.lock_for_upload()
+                image_name = await self.minio_service.upload_file(image_file, keep_in_cache=image_mode == ImageResponseMode.BASE64)
+                await self.image_references.acquire(image_name)
+                # Renditions of a fresh upload may still be rendering, echo the cached original
+                renditions = ()
 
             new_post = Post(
                 title=create_post_request.title,
@@ -53,6 +71,7 @@ class PostService:
             )
 
             saved_post = await self.save(new_post)
+            await event_bus.publish(LifecycleEvent(PostEventType.CREATED, saved_post.id, current_user.id))
 
             return PostResponse(
                 id=saved_post.id,
@@ -61,7 +80,7 @@ class PostService:
                 date=saved_post.date,
                 location=saved_post.location,
                 description=saved_post.description,
-                image=await self.minio_service.get_file_as_base64(saved_post.image_name),
+                image=await self.minio_service.get_response_image(saved_post.image_name, renditions, image_mode),
                 likes=saved_post.likes,
                 isLiked=False,
                 status=saved_post.status
@@ -74,7 +93,94 @@ class PostService:
                 detail=f"Error creating post: {str(e)}"
             )
 
-    async def update_post_data(self, current_user, post_edit_request: PostRequest, image_file: Optional[UploadFile] = None) -> PostResponse:
+    async def create_posts(self, current_user, requests: List[BulkPostRequest], images: List[UploadFile]) -> BulkPostResponse:
+        """Create many posts in one transaction.
+
+        Images are uploaded concurrently, the posts go in with one multi-row
+        INSERT ... RETURNING and the response carries ids and image URLs only.
+        """
+        if not current_user:
+            raise UnauthorizedException("User not authenticated")
+        if not requests:
+            raise BadRequestException("No posts to create")
+        if len(requests) > settings.BULK_MAX_POSTS:
+            raise BadRequestException(f"At most {settings.BULK_MAX_POSTS} posts can be created at once")
+        for request in requests:
+            if request.imageIndex is not None and request.imageIndex >= len(images):
+                raise BadRequestException(f"Image index {request.imageIndex} is out of range")
+
+        uploaded: Dict[int, str] = {}
+        try:
+            semaphore = asyncio.Semaphore(settings.BULK_UPLOAD_CONCURRENCY)
+
+            async def upload(image: UploadFile) -> str:
+                async with semaphore:
+                    return await self.minio_service.upload_file(image)
+
+            used_indexes = sorted({request.imageIndex for request in requests if request.imageIndex is not None})
+            if used_indexes:
+                await self.image_references.lock_for_upload()
+            results = await asyncio.gather(*(upload(images[i]) for i in used_indexes), return_exceptions=True)
+            uploaded = {index: name for index, name in zip(used_indexes, results) if isinstance(name, str)}
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "title": request.title,
+                    "author_id": current_user.id,
+                    "date": now,
+                    "location": request.location,
+                    "description": request.description,
+                    "image_name": uploaded.get(request.imageIndex, DEFAULT_POST_IMAGE),
+                    "likes": 0,
+                    "status": PostStatus.STATUS_NOT_CHECKED,
+                    "updated_at": now
+                }
+                for request in requests
+            ]
+            result = await self.db.execute(insert(Post).returning(Post.id, sort_by_parameter_order=True), rows)
+            post_ids = result.scalars().all()
+            await self.image_references.acquire_many([row["image_name"] for row in rows])
+            await self.db.commit()
+            await event_bus.publish_many([
+                LifecycleEvent(PostEventType.CREATED, post_id, current_user.id, {"bulk": True}) for post_id in post_ids
+            ])
+
+            return BulkPostResponse(posts=[
+                BulkPostCreated(id=post_id, image=self.minio_service.get_file_url(row["image_name"]))
+                for post_id, row in zip(post_ids, rows)
+            ])
+        except (UnauthorizedException, BadRequestException):
+            await self.db.rollback()
+            await self._discard_uploads(list(uploaded.values()))
+            raise
+        except Exception as e:
+            await self.db.rollback()
+            await self._discard_uploads(list(uploaded.values()))
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error creating posts: {str(e)}"
+            )
+
+    async def _discard_uploads(self, image_names: List[str]) -> None:
+        """Delete images uploaded for a failed request, unless deduplication made them shared"""
+        object_names = [
+            name
+            for image_name in set(image_names)
+            for name in (image_name, *(rendition_name(image_name, rendition) for rendition in RENDITIONS))
+        ]
+        if not object_names:
+            return
+        try:
+            await StorageGarbageCollector(self.db, self.minio_service).delete_unreferenced(object_names)
+        except Exception as e:
+            # The storage GC removes them later, the original error is the one to report
+            logger.warning("Could not discard %d uploaded images: %s", len(image_names), e)
+
+    async def update_post_data(self, current_user, post_edit_request: PostRequest, image_file: Optional[UploadFile] = None, image_mode: ImageResponseMode = ImageResponseMode.BASE64) -> PostResponse:
         try:
             if not current_user:
                 raise UnauthorizedException("User not authenticated")
@@ -88,10 +194,16 @@ class PostService:
             post.location = post_edit_request.location
             post.description = post_edit_request.description
 
+            renditions = DETAIL_RENDITIONS
             if image_file and image_file.filename:
-                post.image_name = await self.minio_service.upload_file(image_file)
+                await self.image_references.lock_for_upload()
+                image_name = await self.minio_service.upload_file(image_file, keep_in_cache=image_mode == ImageResponseMode.BASE64)
+                await self.image_references.replace(post.image_name, image_name)
+                post.image_name = image_name
+                renditions = ()
 
             updated_post = await self.save(post)
+            await event_bus.publish(LifecycleEvent(PostEventType.UPDATED, updated_post.id, current_user.id))
 
             return PostResponse(
                 id=updated_post.id,
@@ -100,7 +212,7 @@ class PostService:
                 date=updated_post.date,
                 location=updated_post.location,
                 description=updated_post.description,
-                image=await self.minio_service.get_file_as_base64(updated_post.image_name),
+                image=await self.minio_service.get_response_image(updated_post.image_name, renditions, image_mode),
                 likes=updated_post.likes,
                 isLiked=await self.user_service.is_liked_post(current_user.id, updated_post),
                 status=updated_post.status
@@ -113,7 +225,15 @@ class PostService:
                 detail=f"Error updating post: {str(e)}"
             )
 
-    async def get_post_data(self, post_id: int, current_user: Optional[User] = None) -> PostResponse:
+    def get_post_etag(self, post: Post, is_liked: bool, renditions_ready: bool) -> str:
+        """Weak ETag of a single post as seen by the requesting user.
+
+        Renditions are stored after the post, so their readiness is part of the
+        version: a client that got the original while they rendered refetches once.
+        """
+        return make_weak_etag(post.id, post.updated_at, post.likes, post.image_name, post.status, is_liked, renditions_ready)
+
+    async def get_post_data(self, post_id: int, current_user: Optional[User] = None, if_none_match: Optional[str] = None) -> PostResponse:
         try:
             post = await self.get_post_by_id(post_id)
 
@@ -124,6 +244,11 @@ class PostService:
             if post.status == PostStatus.STATUS_DENIED and current_user.username != post.author.username:
                 raise UnauthorizedException("You are not authorized to view this post")
 
+            # Answer conditional requests before the image is fetched from MinIO
+            etag = self.get_post_etag(post, is_liked, await self.minio_service.renditions_ready(post.image_name))
+            if etag_matches(if_none_match, etag):
+                raise NotModifiedException(etag)
+
             return PostResponse(
                 id=post.id,
                 title=post.title,
@@ -131,12 +256,13 @@ class PostService:
                 date=post.date,
                 location=post.location,
                 description=post.description,
-                image=await self.minio_service.get_file_as_base64(post.image_name),
+                image=await self.minio_service.get_file_as_base64(post.image_name, DETAIL_RENDITIONS),
                 likes=post.likes,
                 isLiked=is_liked,
-                status=post.status
+                status=post.status,
+                etag=etag
             )
-        except (UnauthorizedException, ResourceNotFoundException):
+        except (UnauthorizedException, ResourceNotFoundException, NotModifiedException):
             raise
         except Exception as e:
             raise HTTPException(
@@ -154,8 +280,11 @@ class PostService:
             if post.author.username != current_user.username and current_user.role != Role.ROLE_ADMIN:
                 raise UnauthorizedException("You are not authorized to delete this post")
 
+            payload = {"status": post.status.value, "authorId": post.author_id}
+            await self.image_references.release(post.image_name)
             await self.db.delete(post)
             await self.db.commit()
+            await event_bus.publish(LifecycleEvent(PostEventType.DELETED, post_id, current_user.id, payload))
         except (UnauthorizedException, ResourceNotFoundException):
             raise
         except Exception as e:
@@ -180,6 +309,10 @@ class PostService:
                 await self.user_service.add_like(current_user, post)
 
             await self.save(post)
+            await event_bus.publish(LifecycleEvent(
+                PostEventType.UNLIKED if is_liked else PostEventType.LIKED, post.id, current_user.id,
+                {"likes": post.likes, "status": post.status.value, "authorId": post.author_id}
+            ))
             return post.likes
         except (UnauthorizedException, ResourceNotFoundException):
             raise
@@ -204,6 +337,10 @@ class PostService:
 
             post.status = PostStatus.STATUS_NOT_CHECKED
             await self.save(post)
+            await event_bus.publish(LifecycleEvent(
+                PostEventType.RESUBMITTED, post.id, current_user.id,
+                {"status": post.status.value, "authorId": post.author_id}
+            ))
         except (UnauthorizedException, BadRequestException, ResourceNotFoundException):
             raise
         except Exception as e:
@@ -222,7 +359,8 @@ class PostService:
             if post.author.username != current_user.username and current_user.role != Role.ROLE_ADMIN:
                 raise UnauthorizedException("You are not authorized to reset this post's image")
 
-            post.image_name = "default-post-img.png"
+            await self.image_references.release(post.image_name)
+            post.image_name = DEFAULT_POST_IMAGE
             await self.save(post)
         except (UnauthorizedException, ResourceNotFoundException):
             raise
@@ -249,66 +387,72 @@ class PostService:
                 detail=f"Error getting post: {str(e)}"
             )
 
-    async def find_all_posts(self, page: int, limit: int, sort: str, search: Optional[str] = None, current_user: Optional[User] = None) -> PageResponse[PostResponse]:
+    def build_posts_query(self, sort: str, search: Optional[str] = None, current_user: Optional[User] = None) -> Select:
+        """Filtered and sorted posts query for a feed, without pagination"""
+        query = select(Post)
+
+        if sort == "my-posts":
+            try:
+                if(current_user is not None):
+                    query = query.where(Post.author_id == current_user.id)
+            except Exception:
+                raise UnauthorizedException("User not authenticated")
+        elif sort == "moderator":
+            query = query.where(Post.status == PostStatus.STATUS_NOT_CHECKED)
+        else:
+            query = query.where(Post.status != PostStatus.STATUS_DENIED)
+
+        # Apply search filters
+        if search and search.strip():
+            try:
+                search_params = dict(param.split('=') for param in search.split('&') if '=' in param)
+                
+                if "author" in search_params and sort != "my-posts":
+                    query = query.join(User).where(User.username.ilike(f"%{search_params['author']}%"))
+                
+                if "title" in search_params:
+                    query = query.where(Post.title.ilike(f"%{search_params['title']}%"))
+                
+                if "location" in search_params:
+                    query = query.where(Post.location.ilike(f"%{search_params['location']}%"))
+                
+                if "startDate" in search_params or "endDate" in search_params:
+                    try:
+                        start_date = datetime.fromisoformat(search_params.get("startDate", "")) if "startDate" in search_params else None
+                        end_date = datetime.fromisoformat(search_params.get("endDate", "")) if "endDate" in search_params else None
+                        
+                        if start_date:
+                            query = query.where(Post.date >= start_date)
+                        if end_date:
+                            query = query.where(Post.date <= end_date)
+                    except ValueError as e:
+                        raise BadRequestException(f"Invalid date format: {str(e)}")
+            except Exception as e:
+                raise BadRequestException(f"Invalid search parameters: {str(e)}")
+
+        # Apply sorting
+        if sort == "my-posts":
+            query = query.order_by(Post.status, Post.date.desc())
+        elif sort == "latest" or sort == "date_desc":
+            query = query.order_by(Post.date.desc())
+        elif sort == "date_asc":
+            query = query.order_by(Post.date.asc())
+        elif sort == "likes_desc":
+            query = query.order_by(Post.likes.desc())
+        elif sort == "likes_asc":
+            query = query.order_by(Post.likes.asc())
+        elif sort == "status_desc":
+            query = query.order_by(Post.status.desc())
+        elif sort == "status_asc":
+            query = query.order_by(Post.status.asc())
+        else:
+            query = query.order_by(Post.status.desc(), Post.date.desc())
+
+        return query
+
+    async def find_all_posts(self, page: int, limit: int, sort: str, search: Optional[str] = None, current_user: Optional[User] = None, if_none_match: Optional[str] = None) -> PageResponse[PostResponse]:
         try:
-            query = select(Post)
-
-            if sort == "my-posts":
-                try:
-                    if(current_user is not None):
-                        query = query.where(Post.author_id == current_user.id)
-                except Exception:
-                    raise UnauthorizedException("User not authenticated")
-            elif sort == "moderator":
-                query = query.where(Post.status == PostStatus.STATUS_NOT_CHECKED)
-            else:
-                query = query.where(Post.status != PostStatus.STATUS_DENIED)
-
-            # Apply search filters
-            if search and search.strip():
-                try:
-                    search_params = dict(param.split('=') for param in search.split('&') if '=' in param)
-                    
-                    if "author" in search_params and sort != "my-posts":
-                        query = query.join(User).where(User.username.ilike(f"%{search_params['author']}%"))
-                    
-                    if "title" in search_params:
-                        query = query.where(Post.title.ilike(f"%{search_params['title']}%"))
-                    
-                    if "location" in search_params:
-                        query = query.where(Post.location.ilike(f"%{search_params['location']}%"))
-                    
-                    if "startDate" in search_params or "endDate" in search_params:
-                        try:
-                            start_date = datetime.fromisoformat(search_params.get("startDate", "")) if "startDate" in search_params else None
-                            end_date = datetime.fromisoformat(search_params.get("endDate", "")) if "endDate" in search_params else None
-                            
-                            if start_date:
-                                query = query.where(Post.date >= start_date)
-                            if end_date:
-                                query = query.where(Post.date <= end_date)
-                        except ValueError as e:
-                            raise BadRequestException(f"Invalid date format: {str(e)}")
-                except Exception as e:
-                    raise BadRequestException(f"Invalid search parameters: {str(e)}")
-
-            # Apply sorting
-            if sort == "my-posts":
-                query = query.order_by(Post.status, Post.date.desc())
-            elif sort == "latest" or sort == "date_desc":
-                query = query.order_by(Post.date.desc())
-            elif sort == "date_asc":
-                query = query.order_by(Post.date.asc())
-            elif sort == "likes_desc":
-                query = query.order_by(Post.likes.desc())
-            elif sort == "likes_asc":
-                query = query.order_by(Post.likes.asc())
-            elif sort == "status_desc":
-                query = query.order_by(Post.status.desc())
-            elif sort == "status_asc":
-                query = query.order_by(Post.status.asc())
-            else:
-                query = query.order_by(Post.status.desc(), Post.date.desc())
+            query = self.build_posts_query(sort, search, current_user)
 
             # Apply pagination
             total = await self.db.scalar(select(func.count()).select_from(query.subquery()))
@@ -317,11 +461,25 @@ class PostService:
             result = await self.db.execute(query)
             posts = result.scalars().all()
 
-            content = []
+            liked_flags = []
+            ready_flags = []
             for post in posts:
                 is_liked = False
                 if(current_user is not None):
                     is_liked = await self.user_service.is_liked_post(current_user.id, post)
+                liked_flags.append(is_liked)
+                ready_flags.append(await self.minio_service.renditions_ready(post.image_name))
+
+            # The page is identified by its total and the versions of the posts on it
+            etag = make_weak_etag(
+                page, limit, total,
+                *(self.get_post_etag(post, is_liked, ready) for post, is_liked, ready in zip(posts, liked_flags, ready_flags))
+            )
+            if etag_matches(if_none_match, etag):
+                raise NotModifiedException(etag)
+
+            content = []
+            for post, is_liked in zip(posts, liked_flags):
                 content.append(PostResponse(
                     id=post.id,
                     title=post.title,
@@ -329,7 +487,7 @@ class PostService:
                     date=post.date,
                     location=post.location,
                     description=post.description,
-                    image=await self.minio_service.get_file_as_base64(post.image_name),
+                    image=await self.minio_service.get_file_as_base64(post.image_name, FEED_RENDITIONS),
                     likes=post.likes,
                     isLiked=is_liked,
                     status=post.status
@@ -342,8 +500,11 @@ class PostService:
                 totalElements=total,
                 totalPages=(total + limit - 1) // limit,
                 first=page == 0,
-                last=page * limit + limit >= total
+                last=page * limit + limit >= total,
+                etag=etag
             )
+        except NotModifiedException:
+            raise
         except (UnauthorizedException, BadRequestException) as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -355,6 +516,48 @@ class PostService:
                 detail=f"500: Error finding posts: {str(e)}"
             )
 
+    async def export_posts(self, sort: str, search: Optional[str] = None, current_user: Optional[User] = None, include_images: bool = False, batch_size: int = 500) -> AsyncIterator[bytes]:
+        """Prepare a streaming NDJSON export of the whole feed.
+
+        The query is built and validated here, so bad search parameters fail before
+        the response starts. The returned iterator reads through a server-side cursor
+        `batch_size` rows at a time and writes each batch as one chunk, memory stays
+        flat regardless of the result size. There is no COUNT and no image download,
+        images are exported as URLs.
+        """
+        query = self.build_posts_query(sort, search, current_user).options(
+            selectinload(Post.author),
+            raiseload(Post.liked_users)
+        ).execution_options(yield_per=batch_size)
+
+        liked_ids = set()
+        if current_user is not None:
+            liked = await self.db.scalars(select(user_post_likes.c.post_id).where(user_post_likes.c.user_id == current_user.id))
+            liked_ids = set(liked.all())
+
+        return self._stream_export(query, liked_ids, include_images)
+
+    async def _stream_export(self, query: Select, liked_ids: set, include_images: bool) -> AsyncIterator[bytes]:
+        result = await self.db.stream_scalars(query)
+        async for posts in result.partitions():
+            chunk = bytearray()
+            for post in posts:
+                row = {
+                    "id": post.id,
+                    "title": post.title,
+                    "author": post.author.username,
+                    "date": post.date,
+                    "location": post.location,
+                    "description": post.description,
+                    "likes": post.likes,
+                    "isLiked": post.id in liked_ids,
+                    "status": post.status,
+                }
+                if include_images:
+                    row["image"] = self.minio_service.get_file_url(post.image_name)
+                chunk += orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+            yield bytes(chunk)
+
     async def find_recommended_posts(self) -> PageResponse[PostResponse]:
         try:
             query = select(Post).where(
@@ -380,7 +583,7 @@ class PostService:
                     date=post.date,
                     location=post.location,
                     description=post.description,
-                    image=await self.minio_service.get_file_as_base64(post.image_name),
+                    image=await self.minio_service.get_file_as_base64(post.image_name, FEED_RENDITIONS),
                     likes=post.likes,
                     isLiked=False,
                     status=post.status
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Set, Tuple
+from sqlalchemy import select, union, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.post import Post
+from app.models.user import User
+from app.models.stored_object import StoredObject
+from app.core.storage.base import ObjectInfo
+from ..images import DEFAULT_POST_IMAGE, DEFAULT_USER_IMAGE, RENDITIONS, rendition_name
+from .minio_service import MinioService
+from .image_reference_service import STORAGE_GC_LOCK_KEY
+
+logger = logging.getLogger(__name__)
+
+class StorageGarbageCollector:
+    """Deletes stored objects that no post or user references any more.
+
+    Object keys are streamed from the bucket and diffed against the set of
+    `image_name` values (and their renditions). Objects younger than the grace
+    period are kept so uploads that are not committed yet are never removed.
+    """
+
+    def __init__(self, db: AsyncSession, minio_service: MinioService, batch_size: int = 1000):
+        self.db = db
+        self.minio_service = minio_service
+        self.batch_size = batch_size
+
+    async def run(self, grace_period: timedelta, dry_run: bool = True) -> Dict[str, Any]:
+        started = time.perf_counter()
+        stats = {
+            "dryRun": dry_run,
+            "scanned": 0,
+            "referenced": 0,
+            "recent": 0,
+            "unreferenced": 0,
+            "deleted": 0,
+            "bytesFreed": 0,
+            "errors": 0,
+        }
+
+        referenced = await self._load_referenced_names()
+        cutoff = datetime.now(timezone.utc) - grace_period
+
+        pending: List[ObjectInfo] = []
+        async for batch in self._iter_object_batches():
+            for obj in batch:
+                stats["scanned"] += 1
+                if obj.name in referenced:
+                    stats["referenced"] += 1
+                    continue
+                if obj.last_modified is not None and obj.last_modified > cutoff:
+                    stats["recent"] += 1
+                    continue
+                stats["unreferenced"] += 1
+                pending.append(obj)
+
+            if len(pending) >= self.batch_size:
+                await self._delete(pending, stats, dry_run)
+                pending = []
+        if pending:
+            await self._delete(pending, stats, dry_run)
+
+        duration = time.perf_counter() - started
+        stats["duration"] = duration
+        stats["objectsPerSecond"] = stats["scanned"] / duration if duration else 0
+        logger.info("Storage GC finished: %s", stats)
+        return stats
+
+    async def _load_referenced_names(self) -> Set[str]:
+        referenced = {DEFAULT_POST_IMAGE, DEFAULT_USER_IMAGE}
+        stmt = union(select(Post.image_name), select(User.image_name))
+        result = await self.db.stream_scalars(stmt)
+        async for image_name in result:
+            referenced.add(image_name)
+            for rendition in RENDITIONS:
+                referenced.add(rendition_name(image_name, rendition))
+        return referenced
+
+    async def _iter_object_batches(self):
+        """Pull object listings page by page without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        objects: Iterator = iter(self.minio_service.storage.list_objects())
+        while True:
+            batch = await loop.run_in_executor(None, lambda: list(islice(objects, self.batch_size)))
+            if not batch:
+                return
+            yield batch
+
+    async def _delete(self, objects: List[ObjectInfo], stats: Dict[str, Any], dry_run: bool) -> None:
+        if dry_run:
+            stats["bytesFreed"] += sum(obj.size for obj in objects)
+            return
+
+        deleted, errors = await self.delete_unreferenced([obj.name for obj in objects])
+        kept = len(objects) - len(deleted) - len(errors)
+        stats["unreferenced"] -= kept
+        stats["referenced"] += kept
+        stats["errors"] += len(errors)
+        stats["deleted"] += len(deleted)
+        stats["bytesFreed"] += sum(obj.size for obj in objects if obj.name in deleted)
+
+    async def delete_unreferenced(self, object_names: List[str]) -> Tuple[Set[str], List[Tuple[str, str]]]:
+        """Delete the objects that are still unreferenced, returns the deleted names and the failures.
+
+        The referenced set of a run is loaded before listing, so candidates are checked
+        again under the exclusive GC lock. Uploads hold it in shared mode from their
+        dedup check until their reference commits, so nothing can start using an
+        object between the check and its deletion.
+        """
+        try:
+            await self.db.execute(select(func.pg_advisory_xact_lock(STORAGE_GC_LOCK_KEY)))
+            still_referenced = await self._referenced_among(object_names)
+            candidates = [name for name in object_names if name not in still_referenced]
+
+            errors = []
+            if candidates:
+                errors = await asyncio.get_running_loop().run_in_executor(
+                    None, self.minio_service.storage.delete_many, candidates
+                )
+            for name, message in errors:
+                logger.warning("Storage GC could not delete %s: %s", name, message)
+            failed = {name for name, _ in errors}
+            deleted = {name for name in candidates if name not in failed}
+
+            if deleted:
+                await self.db.execute(delete(StoredObject).where(
+                    StoredObject.object_name.in_(deleted),
+                    StoredObject.ref_count <= 0
+                ))
+            await self.db.commit()
+            return deleted, errors
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def _referenced_among(self, object_names: List[str]) -> Set[str]:
+        """Names of the batch that a post, a user or a stored object reference counts now"""
+        stems = {_source_stem(name) for name in object_names}
+        stmt = union(
+            select(Post.image_name).where(func.split_part(Post.image_name, ".", 1).in_(stems)),
+            select(User.image_name).where(func.split_part(User.image_name, ".", 1).in_(stems)),
+            select(StoredObject.object_name).where(
+                StoredObject.ref_count > 0,
+                func.split_part(StoredObject.object_name, ".", 1).in_(stems)
+            )
+        )
+        referenced = set()
+        for image_name in (await self.db.execute(stmt)).scalars():
+            referenced.add(image_name)
+            for rendition in RENDITIONS:
+                referenced.add(rendition_name(image_name, rendition))
+        return referenced & set(object_names)
+
+
+def _source_stem(object_name: str) -> str:
+    """Content hash of an original or of one of its renditions"""
+    stem = object_name.rsplit(".", 1)[0]
+    for rendition in RENDITIONS:
+        if stem.endswith(f"_{rendition}"):
+            return stem[:-len(rendition) - 1]
+    return stem
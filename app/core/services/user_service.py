@@ -4,11 +4,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.user import User
 from app.models.post import Post
-from app.models.enums import Role
+from app.models.enums import Role, ImageResponseMode
 from app.schemas.user import UserResponse, UserForResponse, UserEditRequest
 from fastapi import UploadFile
 from .minio_service import MinioService
-from ..exceptions import ResourceNotFoundException, UnauthorizedException
+from .image_reference_service import ImageReferenceService
+from ..exceptions import ResourceNotFoundException, UnauthorizedException, NotModifiedException
+from ..http_cache import make_weak_etag, etag_matches
+from ..images import DEFAULT_USER_IMAGE, FEED_RENDITIONS, DETAIL_RENDITIONS
 from app.core.database import get_db
 from fastapi import Depends
 from app.core.auth import oauth2_scheme
@@ -22,6 +25,7 @@ class UserService:
     def __init__(self, db: AsyncSession, minio_service: MinioService):
         self.db = db
         self.minio_service = minio_service
+        self.image_references = ImageReferenceService(db)
 
     async def save(self, user: User) -> User:
         try:
@@ -76,7 +80,7 @@ class UserService:
                 detail=f"Error creating user: {str(e)}"
             )
 
-    async def update_user_data(self, current_user, user_edit_request: UserEditRequest, image_file: Optional[UploadFile] = None) -> Optional[UserResponse]:
+    async def update_user_data(self, current_user, user_edit_request: UserEditRequest, image_file: Optional[UploadFile] = None, image_mode: ImageResponseMode = ImageResponseMode.BASE64) -> Optional[UserResponse]:
         try:
             if not current_user:
                 raise UnauthorizedException("User not authenticated")
@@ -92,16 +96,21 @@ class UserService:
                     )
                 current_user.email = user_edit_request.email
 
+            renditions = DETAIL_RENDITIONS
             if image_file and image_file.filename:
-                image_name = await self.minio_service.upload_file(image_file)
+                await self.image_references.lock_for_upload()
+                image_name = await self.minio_service.upload_file(image_file, keep_in_cache=image_mode == ImageResponseMode.BASE64)
+                await self.image_references.replace(current_user.image_name, image_name)
                 current_user.image_name = image_name
+                # Renditions of a fresh upload may still be rendering, echo the cached original
+                renditions = ()
 
             updated_user = await self.save(current_user)
 
             return UserResponse(
                 username=updated_user.username,
                 email=updated_user.email,
-                image=await self.minio_service.get_file_as_base64(updated_user.image_name)
+                image=await self.minio_service.get_response_image(updated_user.image_name, renditions, image_mode)
             )
         except HTTPException:
             raise
@@ -116,7 +125,8 @@ class UserService:
             if not current_user:
                 raise UnauthorizedException("User not authenticated")
             
-            current_user.image_name = "default-user-img.png"
+            await self.image_references.release(current_user.image_name)
+            current_user.image_name = DEFAULT_USER_IMAGE
             await self.save(current_user)
         except HTTPException:
             raise
@@ -126,15 +136,25 @@ class UserService:
                 detail=f"Error resetting user image: {str(e)}"
             )
 
-    async def get_user_data(self, current_user) -> Optional[UserResponse]:
+    def get_user_etag(self, user: User, renditions_ready: bool) -> str:
+        """Weak ETag of a user profile, including whether the image renditions are stored yet"""
+        return make_weak_etag(user.id, user.updated_at, user.username, user.email, user.image_name, renditions_ready)
+
+    async def get_user_data(self, current_user, if_none_match: Optional[str] = None) -> Optional[UserResponse]:
         try:
             if not current_user:
                 raise UnauthorizedException("User not authenticated")
 
+            # Answer conditional requests before the image is fetched from MinIO
+            etag = self.get_user_etag(current_user, await self.minio_service.renditions_ready(current_user.image_name))
+            if etag_matches(if_none_match, etag):
+                raise NotModifiedException(etag)
+
             return UserResponse(
                 username=current_user.username,
                 email=current_user.email,
-                image=await self.minio_service.get_file_as_base64(current_user.image_name)
+                image=await self.minio_service.get_file_as_base64(current_user.image_name, DETAIL_RENDITIONS),
+                etag=etag
             )
         except HTTPException:
             raise
@@ -150,7 +170,7 @@ class UserService:
                 raise UnauthorizedException(f"User not authenticated")
             
             try:
-                image_db=await self.minio_service.get_file_as_base64(current_user.image_name)
+                image_db=await self.minio_service.get_file_as_base64(current_user.image_name, FEED_RENDITIONS)
             except Exception as e:
                 image_db = None
 
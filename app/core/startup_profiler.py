@@ -0,0 +1,81 @@
+"""Startup timing of the application.
+
+`startup_timeline` records when `app.main` finished importing, when the lifespan
+startup completed and when the first request was answered. Running the module
+prints an import-time breakdown of `app.main`:
+
+    python -m app.core.startup_profiler --top 25
+"""
+import argparse
+import logging
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """Record the first time a startup phase is reached, relative to the origin"""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.origin
+            logger.info("Startup phase %s reached after %.3fs", name, self.marks[name])
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(value, 4) for name, value in self.marks.items()}
+
+
+startup_timeline = StartupTimeline()
+
+
+def profile_imports(module: str) -> List[Tuple[str, int, int]]:
+    """Import a module in a fresh interpreter with -X importtime.
+
+    Returns (module, self_us, cumulative_us) for every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = profile_imports(args.module)
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    total = sum(by_package.values())
+
+    print(f"import {args.module}: {total / 1000:.1f} ms")
+    print("\nBy top-level package (self time):")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {package:<30} {self_us / 1000:8.1f} ms  {100 * self_us / total:5.1f}%")
+    print("\nSlowest modules (cumulative time):")
+    for name, _, cumulative_us in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"  {name:<50} {cumulative_us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
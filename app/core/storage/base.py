@@ -0,0 +1,61 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+
+class StorageError(Exception):
+    pass
+
+
+@dataclass
+class ObjectInfo:
+    name: str
+    size: int
+    last_modified: Optional[datetime]
+
+
+class StorageBackend(ABC):
+    """Blocking object storage interface.
+
+    Callers on the event loop run the methods that touch the network or large
+    files in an executor.
+    """
+
+    name: str
+
+    @abstractmethod
+    def put_stream(self, object_name: str, data: BinaryIO, length: int, content_type: str, part_size: int) -> None:
+        """Store an object read from `data` in chunks, `length` is -1 when unknown"""
+
+    @abstractmethod
+    def put_bytes(self, object_name: str, data: bytes, content_type: str) -> None:
+        pass
+
+    @abstractmethod
+    def get(self, object_name: str) -> Optional[bytes]:
+        """Object contents, or None if it does not exist"""
+
+    @abstractmethod
+    def exists(self, object_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    def touch(self, object_name: str) -> None:
+        """Refresh the last modified time of an existing object"""
+
+    @abstractmethod
+    def delete(self, object_name: str) -> None:
+        pass
+
+    @abstractmethod
+    def delete_many(self, object_names: List[str]) -> List[Tuple[str, str]]:
+        """Delete objects in bulk and return (name, message) for each failure"""
+
+    @abstractmethod
+    def list_objects(self) -> Iterator[ObjectInfo]:
+        pass
+
+    def local_path(self, object_name: str) -> Optional[str]:
+        """Filesystem path of the object when it can be served with sendfile"""
+        return None
@@ -0,0 +1,232 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryLRUCache:
+    """Per-process LRU cache bounded by the total size of the values"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._items[key] = value
+            self.current_bytes += len(value)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            value = self._items.pop(key, None)
+            if value is not None:
+                self.current_bytes -= len(value)
+
+
+class DiskLRUCache:
+    """Size-bounded cache directory shared by all worker processes on the host.
+
+    Entries are written atomically, a hit refreshes the file mtime and eviction
+    removes the least recently used files once the directory grows past its limit.
+    The directory survives restarts, so a new worker starts warm.
+    """
+
+    def __init__(self, root: str, max_bytes: int, evict_to_ratio: float = 0.9):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.evict_to_ratio = evict_to_ratio
+        os.makedirs(self.root, exist_ok=True)
+        # Bytes written by this process since the last size scan
+        self._written_since_scan = max_bytes
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as file:
+                value = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        path = self._path(key)
+        if path is None or len(value) > self.max_bytes:
+            return
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    tmp.write(value)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning("Could not write %s to the disk cache: %s", key, e)
+            return
+
+        with self._lock:
+            self._written_since_scan += len(value)
+            should_evict = self._written_since_scan >= self.max_bytes * (1 - self.evict_to_ratio)
+            if should_evict:
+                self._written_since_scan = 0
+        if should_evict:
+            self.evict()
+
+    def invalidate(self, key: str) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits its target size"""
+        entries = []
+        total = 0
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+
+        target = self.max_bytes * self.evict_to_ratio
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                total -= size
+
+    def _path(self, key: str) -> Optional[str]:
+        if not key or "/" in key or "\\" in key or key.startswith("."):
+            return None
+        return os.path.join(self.root, key[:2], key)
+
+
+class TieredImageCache:
+    """Memory LRU in front of an optional disk LRU in front of the storage backend.
+
+    Object names are content-addressed and immutable, so entries never go stale.
+    Misses are remembered briefly to avoid refetching renditions that do not exist yet,
+    objects known to exist are remembered until evicted.
+    """
+
+    def __init__(self, memory: Optional[MemoryLRUCache], disk: Optional[DiskLRUCache], miss_ttl: float = 30.0):
+        self.memory = memory
+        self.disk = disk
+        self.miss_ttl = miss_ttl
+        self._misses: Dict[str, float] = {}
+        self._present: Dict[str, bool] = {}
+        self.hits = {"memory": 0, "disk": 0}
+        self.lookups = 0
+
+    def get_from_memory(self, key: str) -> Optional[bytes]:
+        """Cheap lookup that is safe to do on the event loop"""
+        self.lookups += 1
+        if self.memory is not None:
+            value = self.memory.get(key)
+            if value is not None:
+                self.hits["memory"] += 1
+                return value
+        return None
+
+    def get_from_disk(self, key: str) -> Optional[bytes]:
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.hits["disk"] += 1
+                if self.memory is not None:
+                    self.memory.put(key, value)
+                return value
+        return None
+
+    def put(self, key: str, value: bytes) -> None:
+        self._misses.pop(key, None)
+        self.record_present(key)
+        if self.memory is not None:
+            self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def is_known_miss(self, key: str) -> bool:
+        expires = self._misses.get(key)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            self._misses.pop(key, None)
+            return False
+        return True
+
+    def record_miss(self, key: str) -> None:
+        if len(self._misses) > 10000:
+            self._misses.clear()
+        self._misses[key] = time.monotonic() + self.miss_ttl
+
+    def is_known_present(self, key: str) -> bool:
+        return key in self._present
+
+    def record_present(self, key: str) -> None:
+        if len(self._present) > 10000:
+            self._present.clear()
+        self._present[key] = True
+
+    def invalidate(self, key: str) -> None:
+        self._misses.pop(key, None)
+        self._present.pop(key, None)
+        if self.memory is not None:
+            self.memory.invalidate(key)
+        if self.disk is not None:
+            self.disk.invalidate(key)
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            "lookups": self.lookups,
+            "memoryHits": self.hits["memory"],
+            "diskHits": self.hits["disk"],
+            "memoryBytes": self.memory.current_bytes if self.memory is not None else 0,
+        }
@@ -0,0 +1,27 @@
+from functools import lru_cache
+from app.core.config.config import settings
+from .base import StorageBackend
+from .cache import TieredImageCache, MemoryLRUCache, DiskLRUCache
+
+
+@lru_cache()
+def get_storage_backend() -> StorageBackend:
+    """Storage backend selected by STORAGE_BACKEND, shared by the whole process"""
+    if settings.STORAGE_BACKEND == "local":
+        from .local_backend import LocalStorageBackend
+        return LocalStorageBackend(settings.LOCAL_STORAGE_PATH)
+    if settings.STORAGE_BACKEND == "minio":
+        from .minio_backend import MinioStorageBackend
+        return MinioStorageBackend()
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+
+@lru_cache()
+def get_image_cache() -> TieredImageCache:
+    """Image cache in front of the storage backend, the memory tier is per process"""
+    memory = MemoryLRUCache(settings.IMAGE_MEMORY_CACHE_BYTES) if settings.IMAGE_MEMORY_CACHE_BYTES > 0 else None
+    disk = None
+    # The local backend already reads from disk, a disk tier would only duplicate it
+    if settings.IMAGE_DISK_CACHE_BYTES > 0 and get_storage_backend().name != "local":
+        disk = DiskLRUCache(settings.IMAGE_DISK_CACHE_PATH, settings.IMAGE_DISK_CACHE_BYTES)
+    return TieredImageCache(memory, disk)
@@ -0,0 +1,116 @@
+import io
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from minio import Minio
+from minio.commonconfig import CopySource, REPLACE
+from minio.deleteobjects import DeleteObject
+from minio.error import S3Error
+from app.core.config.config import settings
+from .base import StorageBackend, StorageError, ObjectInfo
+
+
+class MinioStorageBackend(StorageBackend):
+    name = "minio"
+
+    def __init__(self):
+        # Parse the URL to get just the host and port
+        parsed_url = urlparse(settings.MINIO_URL)
+        endpoint = f"{parsed_url.hostname}:{parsed_url.port}"
+
+        self.client = Minio(
+            endpoint=endpoint,
+            access_key=settings.MINIO_ACCESS_KEY,
+            secret_key=settings.MINIO_SECRET_KEY,
+            secure=False
+        )
+        self.bucket_name = settings.MINIO_BUCKET
+
+    def put_stream(self, object_name: str, data: BinaryIO, length: int, content_type: str, part_size: int) -> None:
+        try:
+            self.client.put_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                data=data,
+                length=length,
+                part_size=part_size,
+                content_type=content_type
+            )
+        except S3Error as e:
+            raise StorageError(f"Error uploading file to MinIO: {str(e)}")
+
+    def put_bytes(self, object_name: str, data: bytes, content_type: str) -> None:
+        try:
+            self.client.put_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                data=io.BytesIO(data),
+                length=len(data),
+                content_type=content_type
+            )
+        except S3Error as e:
+            raise StorageError(f"Error uploading file to MinIO: {str(e)}")
+
+    def get(self, object_name: str) -> Optional[bytes]:
+        response = None
+        try:
+            response = self.client.get_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name
+            )
+            return response.read()
+        except S3Error:
+            return None
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+
+    def exists(self, object_name: str) -> bool:
+        try:
+            self.client.stat_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name
+            )
+            return True
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                return False
+            raise StorageError(f"Error checking file existence in MinIO: {str(e)}")
+
+    def touch(self, object_name: str) -> None:
+        try:
+            stat = self.client.stat_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name
+            )
+            # S3 only copies an object onto itself when the metadata is replaced
+            self.client.copy_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                source=CopySource(self.bucket_name, object_name),
+                metadata={"Content-Type": stat.content_type},
+                metadata_directive=REPLACE
+            )
+        except S3Error as e:
+            raise StorageError(f"Error refreshing file in MinIO: {str(e)}")
+
+    def delete(self, object_name: str) -> None:
+        try:
+            self.client.remove_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name
+            )
+        except S3Error as e:
+            raise StorageError(f"Error deleting file from MinIO: {str(e)}")
+
+    def delete_many(self, object_names: List[str]) -> List[Tuple[str, str]]:
+        errors = self.client.remove_objects(
+            self.bucket_name,
+            (DeleteObject(name) for name in object_names)
+        )
+        # remove_objects is lazy, the request is only sent while iterating the errors
+        return [(error.name, error.message) for error in errors]
+
+    def list_objects(self) -> Iterator[ObjectInfo]:
+        for obj in self.client.list_objects(self.bucket_name, recursive=True):
+            yield ObjectInfo(name=obj.object_name, size=obj.size or 0, last_modified=obj.last_modified)
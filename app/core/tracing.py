@@ -0,0 +1,134 @@
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Upper bounds of the phase histogram buckets in milliseconds, the last bucket is open
+HISTOGRAM_BUCKETS_MS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class RequestTrace:
+    """Per-phase durations collected while serving one request.
+
+    Nested spans of the same phase are only counted once, so a storage call
+    made from another storage call does not double the phase total.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, List[float]] = {}
+        self._active: Dict[str, int] = {}
+
+    def enter(self, phase: str) -> bool:
+        depth = self._active.get(phase, 0)
+        self._active[phase] = depth + 1
+        return depth == 0
+
+    def exit(self, phase: str, duration: Optional[float]) -> None:
+        self._active[phase] -= 1
+        if duration is not None:
+            totals = self.phases.setdefault(phase, [0.0, 0])
+            totals[0] += duration
+            totals[1] += 1
+
+    def server_timing(self) -> str:
+        entries = [
+            f'{phase};dur={total * 1000:.2f};desc="{count} calls"'
+            for phase, (total, count) in self.phases.items()
+        ]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def start_trace() -> Tuple[RequestTrace, Any]:
+    trace = RequestTrace()
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token: Any) -> None:
+    _current_trace.reset(token)
+
+
+@contextmanager
+def span(phase: str):
+    """Time a block as part of the current request's phase, a no-op outside a request"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    outermost = trace.enter(phase)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.exit(phase, time.perf_counter() - started if outermost else None)
+
+
+def traced(phase: str) -> Callable:
+    """Decorator wrapping a sync or async function in a span"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(phase):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class PhaseHistograms:
+    """Per-route, per-phase latency histograms aggregated from finished requests"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def record(self, route: str, trace: RequestTrace, total: float) -> None:
+        samples = [(phase, duration) for phase, (duration, _) in trace.phases.items()]
+        samples.append(("total", total))
+        with self._lock:
+            phases = self._routes.setdefault(route, {})
+            for phase, duration in samples:
+                histogram = phases.get(phase)
+                if histogram is None:
+                    histogram = phases[phase] = {
+                        "count": 0,
+                        "sumMs": 0.0,
+                        "buckets": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1),
+                    }
+                duration_ms = duration * 1000
+                histogram["count"] += 1
+                histogram["sumMs"] += duration_ms
+                histogram["buckets"][bisect_left(HISTOGRAM_BUCKETS_MS, duration_ms)] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        labels = [f"le{bound:g}" for bound in HISTOGRAM_BUCKETS_MS] + ["inf"]
+        with self._lock:
+            return {
+                route: {
+                    phase: {
+                        "count": histogram["count"],
+                        "avgMs": round(histogram["sumMs"] / histogram["count"], 3),
+                        "buckets": dict(zip(labels, histogram["buckets"])),
+                    }
+                    for phase, histogram in phases.items()
+                }
+                for route, phases in self._routes.items()
+            }
+
+
+phase_histograms = PhaseHistograms()
@@ -0,0 +1,13 @@
+from typing import Optional
+from fastapi import UploadFile
+from app.core.config.config import settings
+from app.core.exceptions import BadRequestException
+
+
+async def read_json_part(part: UploadFile, max_size: Optional[int] = None) -> bytes:
+    """Read the JSON part of a multipart request without buffering more than the limit"""
+    max_size = max_size or settings.MAX_JSON_PART_SIZE
+    data = await part.read(max_size + 1)
+    if len(data) > max_size:
+        raise BadRequestException(f"JSON part exceeds the maximum size of {max_size} bytes")
+    return data
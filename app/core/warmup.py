@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict
+from sqlalchemy import text
+from app.core.config.config import settings
+from app.core.database import engine, async_session
+from app.core.images import DEFAULT_POST_IMAGE, DEFAULT_USER_IMAGE
+from app.core.security import get_password_hash, verify_password
+from app.core.services.jwt_service import JWTService
+from app.core.services.minio_service import MinioService
+from app.core.services.post_service import PostService
+from app.core.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_connections() -> None:
+    """Open the pool connections up front so first requests do not pay the handshake"""
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(engine.pool.size())))
+
+
+async def _warm_auth() -> None:
+    """Load the bcrypt and JWT backends"""
+    jwt_service = JWTService()
+    token = jwt_service.generate_token({"username": "warmup", "email": "warmup@example.com", "id": 0, "role": "ROLE_USER"})
+    jwt_service.verify_token(token)
+    password_hash = await asyncio.get_running_loop().run_in_executor(None, get_password_hash, "warmup1")
+    await asyncio.get_running_loop().run_in_executor(None, verify_password, "warmup1", password_hash)
+
+
+async def _warm_default_images() -> None:
+    minio_service = MinioService()
+    await asyncio.gather(
+        minio_service.get_file(DEFAULT_POST_IMAGE),
+        minio_service.get_file(DEFAULT_USER_IMAGE),
+    )
+
+
+async def _warm_posts() -> None:
+    """Run the recommended and first feed page queries, which also fills the image cache"""
+    async with async_session() as session:
+        minio_service = MinioService()
+        post_service = PostService(
+            db=session,
+            user_service=UserService(session, minio_service),
+            minio_service=minio_service
+        )
+        await post_service.find_recommended_posts()
+        for page in range(settings.WARMUP_FEED_PAGES):
+            await post_service.find_all_posts(page, settings.WARMUP_PAGE_SIZE, "latest")
+
+
+WARMUP_STEPS: Dict[str, Callable[[], Awaitable[None]]] = {
+    "connections": _warm_connections,
+    "auth": _warm_auth,
+    "defaultImages": _warm_default_images,
+    "posts": _warm_posts,
+}
+
+
+async def warm_up(time_budget: float) -> Dict[str, Any]:
+    """Run the warmup steps in order until the time budget runs out.
+
+    Failures are logged and never prevent the application from starting.
+    """
+    report: Dict[str, Any] = {}
+    deadline = time.perf_counter() + time_budget
+    for name, step in WARMUP_STEPS.items():
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            report[name] = "skipped"
+            continue
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(step(), timeout=remaining)
+            report[name] = round(time.perf_counter() - started, 4)
+        except asyncio.TimeoutError:
+            report[name] = "timeout"
+        except Exception as e:
+            logger.warning("Warmup step %s failed: %s", name, e)
+            report[name] = "failed"
+    logger.info("Warmup finished: %s", report)
+    return report
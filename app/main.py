@@ -1,9 +1,10 @@
+from app.core.startup_profiler import startup_timeline
 import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config.config import get_settings
-from app.api.v1.endpoints import auth, user, post, moderator, admin
-from app.core.database import engine, Base, get_db
+from app.api.v1.endpoints import auth, user, post, moderator, admin, jobs, image, metrics
+from app.core.database import engine, get_db
 from app.core.exception_handlers import (
     validation_exception_handler,
     http_exception_handler,
@@ -11,6 +12,7 @@ from app.core.exception_handlers import (
     unauthorized_handler,
     bad_request_handler,
     storage_unavailable_handler,
+    not_modified_handler,
     sqlalchemy_error_handler,
     general_exception_handler
 )
@@ -19,10 +21,23 @@ from app.core.exceptions import (
     ResourceNotFoundException,
     UnauthorizedException,
     BadRequestException,
-    StorageUnavailableException
+    StorageUnavailableException,
+    NotModifiedException
 )
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.middleware.metrics import MetricsMiddleware
+from app.core.middleware.compression import CompressionMiddleware
+from app.core.middleware.startup_timing import StartupTimingMiddleware
+from app.core.middleware.profiling import ProfilingMiddleware
+from app.core.middleware.server_timing import ServerTimingMiddleware
+from app.core.middleware.query_counter import QueryCounterMiddleware
+from app.core.middleware.rate_limit import RateLimitMiddleware
+from app.core.rate_limit import get_rate_limiter
+from app.core.job_queue import job_queue
+from app.core.event_bus import event_bus
+from app.core.feed_updates import feed_updates
+from app.core.warmup import warm_up
+from app.core.schema import check_schema_version
 from contextlib import asynccontextmanager
 
 settings = get_settings()
@@ -30,10 +45,20 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Migrations are applied out of band, only the schema version is checked here
+    await check_schema_version(engine, settings.SCHEMA_VERSION_CHECK)
+    await job_queue.start()
+    event_bus.subscribe(feed_updates.handle_events)
+    await event_bus.start()
+    if settings.WARMUP_ENABLED:
+        # Runs before the server starts accepting requests
+        app.state.warmup = await warm_up(settings.WARMUP_TIME_BUDGET_SECONDS)
+    startup_timeline.mark("lifespan")
     yield
     # Shutdown
+    await job_queue.stop()
+    # Buffered audit events are flushed before the connection pool goes away
+    await event_bus.stop()
     await engine.dispose()
 
 app = FastAPI(
@@ -44,6 +69,15 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Ограничение частоты запросов, отбрасывает лишнее до роутинга и обращений к БД.
+# Добавляется раньше CORS и метрик, то есть внутри них: ответы 429 получают CORS-заголовки и попадают в метрики
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=get_rate_limiter(),
+        trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED,
+    )
+
 # Конфигурация CORS как я понял, кринж полный
 app.add_middleware(
     CORSMiddleware,
@@ -56,6 +90,41 @@ app.add_middleware(
 # Добавляем middleware для метрик
 app.add_middleware(MetricsMiddleware)
 
+# Замеры фаз запроса (БД, хранилище, сериализация) в заголовке Server-Timing
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Подсчёт SQL-запросов на запрос и поиск N+1
+if settings.QUERY_COUNTER_ENABLED:
+    app.add_middleware(
+        QueryCounterMiddleware,
+        default_budget=settings.QUERY_BUDGET_DEFAULT,
+        budgets=settings.QUERY_BUDGETS,
+        repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+    )
+
+# Выборочное профилирование запросов
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval=settings.PROFILING_INTERVAL_SECONDS,
+        output_dir=settings.PROFILING_OUTPUT_DIR,
+        header=settings.PROFILING_HEADER,
+    )
+
+# Время до первого обработанного запроса
+app.add_middleware(StartupTimingMiddleware)
+
+# Сжатие ответов (brotli/gzip), добавляется последним, чтобы оборачивать все остальные
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 # Register exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -63,6 +132,7 @@ app.add_exception_handler(ResourceNotFoundException, resource_not_found_handler)
 app.add_exception_handler(UnauthorizedException, unauthorized_handler)
 app.add_exception_handler(BadRequestException, bad_request_handler)
 app.add_exception_handler(StorageUnavailableException, storage_unavailable_handler)
+app.add_exception_handler(NotModifiedException, not_modified_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_error_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
@@ -72,6 +142,11 @@ app.include_router(user.router, prefix=settings.API_V1_STR)
 app.include_router(post.router, prefix=settings.API_V1_STR)
 app.include_router(moderator.router, prefix=settings.API_V1_STR)
 app.include_router(admin.router, prefix=settings.API_V1_STR)
+app.include_router(jobs.router, prefix=settings.API_V1_STR)
+app.include_router(image.router, prefix=settings.API_V1_STR)
+app.include_router(metrics.router, prefix=settings.API_V1_STR)
+
+startup_timeline.mark("imports")
 
 @app.get("/")
 async def root():
@@ -8,7 +8,7 @@ class Role(str, Enum):
 class PostStatus(str, Enum):
     STATUS_NOT_CHECKED = "STATUS_NOT_CHECKED"
     STATUS_VERIFIED = "STATUS_VERIFIED"
-    STATUS_DENIED = "STATUS_VERIFIED"
+    STATUS_DENIED = "STATUS_DENIED"
 
 class PostFilter(str, Enum):
     MY_POST = "my-posts"
@@ -21,4 +21,8 @@ class PostSort(str, Enum):
     LIKES_DESC = "likes_desc"
     STATUS_ASC = "status_asc"
     STATUS_DESC = "status_desc"
-    LATEST = "latest" 
\ No newline at end of file
+    LATEST = "latest"
+
+class ImageResponseMode(str, Enum):
+    BASE64 = "base64"
+    URL = "url"
@@ -10,6 +10,9 @@ from app.models.enums import PostStatus
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        sa.Index("ix_posts_pending_date", "date", postgresql_where=sa.text("status = 'STATUS_NOT_CHECKED'")),
+    )
 
     id = Column(Integer, Sequence('posts_seq'), primary_key=True, index=True, autoincrement=True)
     title = Column(String, nullable=False)
@@ -20,9 +23,13 @@ class Post(Base):
     image_name = Column(String, nullable=False, default="default-post-img.png")
     likes = Column(Integer, nullable=False, default=0)
     status = Column(SQLEnum(PostStatus), nullable=False, default=PostStatus.STATUS_NOT_CHECKED)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Moderation queue lease, see ModeratorService.claim_posts
+    claimed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    claimed_until = Column(DateTime, nullable=True)
 
     # Relationships
-    author = relationship("User", back_populates="posts", lazy="selectin")
+    author = relationship("User", back_populates="posts", lazy="selectin", foreign_keys=[author_id])
     liked_users = relationship("User", secondary="user_post_likes", back_populates="liked_posts", lazy="selectin")
 
     async def is_liked_by(self, user_id: int) -> bool:
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Index, JSON
+from datetime import datetime
+
+from app.models.base import Base
+
+class PostEvent(Base):
+    """Append-only audit log of post lifecycle changes, written in batches by the event bus"""
+    __tablename__ = "post_events"
+    __table_args__ = (
+        Index("ix_post_events_post_id_created_at", "post_id", "created_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(String(32), nullable=False)
+    # No foreign keys, events outlive deleted posts and users
+    post_id = Column(Integer, nullable=False)
+    actor_id = Column(Integer, nullable=True)
+    payload = Column(JSON, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+
+from app.models.base import Base
+
+class StoredObject(Base):
+    """Content-addressed object in MinIO and the number of rows referencing it"""
+    __tablename__ = "stored_objects"
+
+    object_name = Column(String, primary_key=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,13 +1,11 @@
-from sqlalchemy import Column, Integer, Sequence, String, Enum as SQLEnum, Table, ForeignKey
+from sqlalchemy import Column, Integer, Sequence, String, DateTime, Enum as SQLEnum, Table, ForeignKey
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 from app.models.enums import Role
-from passlib.context import CryptContext
 from ..core.security import get_password_hash
+from datetime import datetime
 import sqlalchemy as sa
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # Association table for user-post likes
 user_post_likes = Table(
     'user_post_likes',
@@ -25,9 +23,10 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     image_name = Column(String, nullable=False, default="default-user-img.png")
     role = Column(SQLEnum(Role), nullable=False, default=Role.ROLE_USER)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    posts = relationship("Post", back_populates="author", cascade="all, delete-orphan", lazy="selectin")
+    posts = relationship("Post", back_populates="author", cascade="all, delete-orphan", lazy="selectin", foreign_keys="Post.author_id")
     liked_posts = relationship("Post", secondary=user_post_likes, back_populates="liked_users", lazy="selectin")
 
     def __init__(self, **kwargs):
@@ -32,6 +32,16 @@ class PostRequest(BaseModel):
         example="Потрясающие закаты, белоснежные дома и синее море..."
     )
 
+class BulkPostRequest(PostRequest):
+    imageIndex: Optional[int] = Field(None, ge=0, description="Номер изображения среди загруженных файлов")
+
+class BulkPostCreated(BaseModel):
+    id: int = Field(..., description="Id созданного поста")
+    image: str = Field(..., description="URL изображения поста")
+
+class BulkPostResponse(BaseModel):
+    posts: List[BulkPostCreated]
+
 class PostResponse(BaseModel):
     id: int = Field(..., description="Id поста", example="1")
     title: str = Field(..., description="Название поста", example="Невероятные виды Санторини")
@@ -43,6 +53,7 @@ class PostResponse(BaseModel):
     likes: int = Field(..., description="Кол-во лайков на посте", example="123")
     isLiked: bool = Field(..., description="Признак того, что пост лайкнут запросившим пользователем", example="true")
     status: PostStatus = Field(..., description="Статус проверки")
+    etag: Optional[str] = Field(None, exclude=True, description="Слабый ETag версии поста")
 
 class PageResponse(BaseModel, Generic[T]):
     content: List[T]
@@ -52,6 +63,20 @@ class PageResponse(BaseModel, Generic[T]):
     totalPages: int
     first: bool
     last: bool
+    etag: Optional[str] = Field(None, exclude=True)
 
 class PageResponseWrapper(BaseModel, Generic[T]):
-    data: PageResponse[T] 
\ No newline at end of file
+    data: PageResponse[T] 
+
+class ModerationClaimResponse(BaseModel):
+    posts: List[PostResponse] = Field(..., description="Посты, закреплённые за модератором")
+    leaseExpiresAt: datetime = Field(..., description="Время, до которого посты закреплены за модератором")
+
+class ModerationDecisionRequest(BaseModel):
+    approved: List[int] = Field(default_factory=list, description="Id одобренных постов")
+    rejected: List[int] = Field(default_factory=list, description="Id отклонённых постов")
+
+class ModerationDecisionResponse(BaseModel):
+    approved: List[int] = Field(..., description="Id одобренных постов")
+    rejected: List[int] = Field(..., description="Id отклонённых постов")
+    skipped: List[int] = Field(..., description="Id постов без действующей блокировки модератора, решение не применено")
@@ -54,4 +54,5 @@ class UserMinResponse(BaseModel):
 class UserResponse(BaseModel):
     username: str = Field(..., description="Логин пользователя", example="Jon2000")
     email: EmailStr = Field(..., description="Адрес электронной почты", example="jondoe@gmail.com")
-    image: Optional[str] = Field(None, description="base64 изображения") 
\ No newline at end of file
+    image: Optional[str] = Field(None, description="base64 изображения")
+    etag: Optional[str] = Field(None, exclude=True, description="Слабый ETag версии профиля") 
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""Serialization and compression benchmark for feed pages.
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) with ORJSONModelResponse
+and reports bytes on the wire for identity, gzip and brotli encodings.
+
+    python -m benchmarks.bench_serialization --posts 10 --image-kb 200
+"""
+import argparse
+import base64
+import gzip
+import os
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.core.responses import ORJSONModelResponse
+from app.schemas.post import PageResponse, PostResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def build_page(posts: int, image_kb: int) -> PageResponse[PostResponse]:
+    content = []
+    for i in range(posts):
+        # Random bytes stand in for already-compressed JPEG/PNG data
+        image = base64.b64encode(os.urandom(image_kb * 1024)).decode("utf-8")
+        content.append(PostResponse(
+            id=i,
+            title=f"Post {i}",
+            author=f"user{i % 7}",
+            date=datetime(2024, 1, 1) + timedelta(hours=i),
+            location="Санторини, Греция",
+            description="Потрясающие закаты, белоснежные дома и синее море... " * 30,
+            image=f"data:image/jpeg;base64,{image}",
+            likes=i * 3,
+            isLiked=i % 2 == 0,
+            status="STATUS_VERIFIED"
+        ))
+    return PageResponse(
+        content=content,
+        page=0,
+        size=posts,
+        totalElements=posts,
+        totalPages=1,
+        first=True,
+        last=True
+    )
+
+
+def timed(func, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=10)
+    parser.add_argument("--image-kb", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    page = build_page(args.posts, args.image_kb)
+
+    default_ms = timed(lambda: JSONResponse(jsonable_encoder(page)), args.repeat)
+    orjson_ms = timed(lambda: ORJSONModelResponse(page), args.repeat)
+
+    body = ORJSONModelResponse(page).body
+    sizes = {"identity": len(body)}
+    compress_ms = {"identity": 0.0}
+    compress_ms["gzip"] = timed(lambda: gzip.compress(body, compresslevel=6), args.repeat)
+    sizes["gzip"] = len(gzip.compress(body, compresslevel=6))
+    if brotli is not None:
+        compress_ms["br"] = timed(lambda: brotli.compress(body, quality=4), args.repeat)
+        sizes["br"] = len(brotli.compress(body, quality=4))
+
+    print(f"page: {args.posts} posts, {args.image_kb}KB images")
+    print(f"serialization CPU per page: default {default_ms:.2f} ms, orjson {orjson_ms:.2f} ms "
+          f"(saved {default_ms - orjson_ms:.2f} ms, x{default_ms / orjson_ms:.1f})")
+    for encoding, size in sizes.items():
+        saved = 100 * (1 - size / sizes["identity"])
+        print(f"{encoding:>8}: {size:>10} bytes ({saved:5.1f}% saved, {compress_ms[encoding]:.2f} ms CPU)")
+
+
+if __name__ == "__main__":
+    main()
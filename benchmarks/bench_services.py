@@ -0,0 +1,133 @@
+"""Micro-benchmarks for service-layer hot paths, isolated from HTTP and the database.
+
+Each case runs against in-memory or local fakes: queries are built and compiled
+without a connection, images come from a temporary local storage backend. Results
+can be stored and diffed like the load test baselines.
+
+    python -m benchmarks.bench_services
+    python -m benchmarks.bench_services --only jwt --save services-main
+    python -m benchmarks.bench_services --compare services-main
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.security import get_password_hash, verify_password
+from app.core.services.jwt_service import JWTService
+from app.core.services.minio_service import MinioService
+from app.core.services.post_service import PostService
+from app.core.storage.cache import MemoryLRUCache, TieredImageCache
+from app.core.storage.local_backend import LocalStorageBackend
+from app.schemas.post import PageResponse, PostResponse
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+def measure(func: Callable[[], object], number: int, repeat: int) -> Dict[str, float]:
+    """Best and median time per call in microseconds over `repeat` rounds of `number` calls"""
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number * 1e6)
+    return {"bestUs": round(min(rounds), 2), "medianUs": round(statistics.median(rounds), 2)}
+
+
+def query_cases() -> Dict[str, Callable[[], object]]:
+    post_service = PostService(db=None, user_service=None, minio_service=None)
+    dialect = postgresql.dialect()
+    search = "title=Закат&location=Рим&startDate=2024-01-01"
+    return {
+        "query.build": lambda: post_service.build_posts_query("latest", search),
+        "query.build+compile": lambda: post_service.build_posts_query("latest", search).compile(dialect=dialect),
+    }
+
+
+def response_cases() -> Dict[str, Callable[[], object]]:
+    date = datetime(2024, 1, 1)
+
+    def build_page() -> PageResponse[PostResponse]:
+        content = [
+            PostResponse(
+                id=i, title=f"Post {i}", author="bench_user_00001", date=date + timedelta(hours=i),
+                location="Санторини, Греция", description="Потрясающие закаты..." * 20,
+                image="/api/v1/images/default-post-img.png", likes=i, isLiked=i % 2 == 0, status="STATUS_VERIFIED",
+            )
+            for i in range(10)
+        ]
+        return PageResponse(content=content, page=0, size=10, totalElements=100, totalPages=10, first=True, last=False)
+
+    return {"response.page10": build_page}
+
+
+def image_cases(root: str, image_kb: int) -> Dict[str, Callable[[], object]]:
+    storage = LocalStorageBackend(root)
+    storage.put_bytes("bench.jpg", os.urandom(image_kb * 1024), "image/jpeg")
+    cached = MinioService(storage=storage, cache=TieredImageCache(MemoryLRUCache(64 * 1024 * 1024), None))
+    uncached = MinioService(storage=storage, cache=TieredImageCache(None, None))
+    loop = asyncio.new_event_loop()
+    return {
+        "image.base64.memory": lambda: loop.run_until_complete(cached.get_file_as_base64("bench.jpg")),
+        "image.base64.storage": lambda: loop.run_until_complete(uncached.get_file_as_base64("bench.jpg")),
+    }
+
+
+def auth_cases() -> Dict[str, Callable[[], object]]:
+    jwt_service = JWTService()
+    user = {"id": 1, "username": "bench_user_00001", "email": "bench@bench.local", "role": "ROLE_USER"}
+    token = jwt_service.generate_token(user)
+    password_hash = get_password_hash("bench_password1")
+    return {
+        "jwt.generate": lambda: jwt_service.generate_token(user),
+        "jwt.verify": lambda: jwt_service.verify_token(token),
+        "password.verify": lambda: verify_password("bench_password1", password_hash),
+    }
+
+
+# bcrypt is deliberately slow, it gets far fewer iterations than the rest
+NUMBERS = {"password.verify": 5, "image.base64.storage": 100}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="run the cases whose name starts with this prefix")
+    parser.add_argument("--number", type=int, default=1000, help="calls per round")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds per case")
+    parser.add_argument("--image-kb", type=int, default=100)
+    parser.add_argument("--save", metavar="NAME", help="store the result as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="diff the result against baselines/NAME.json")
+    args = parser.parse_args()
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as root:
+        cases = {**query_cases(), **response_cases(), **image_cases(root, args.image_kb), **auth_cases()}
+        names: List[str] = [name for name in cases if not args.only or name.startswith(args.only)]
+        for name in names:
+            number = min(args.number, NUMBERS.get(name, args.number))
+            results[name] = measure(cases[name], number, args.repeat)
+            previous = baseline.get(name, {}).get("medianUs")
+            change = f" ({(results[name]['medianUs'] - previous) / previous * 100:+.1f}%)" if previous else ""
+            print(f"{name:<24} best {results[name]['bestUs']:>12.2f} us  median {results[name]['medianUs']:>12.2f} us{change}")
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, f"{args.save}.json"), "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
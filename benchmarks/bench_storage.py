@@ -0,0 +1,61 @@
+"""Head-to-head benchmark of the storage backends.
+
+Writes, reads and deletes objects of a given size through each backend and
+prints operations per second. The MinIO backend needs the MINIO_* settings and
+a running server, it is skipped if it cannot be reached.
+
+    python -m benchmarks.bench_storage --objects 200 --size-kb 256
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from typing import Callable, List
+
+from app.core.storage.base import StorageBackend
+from app.core.storage.local_backend import LocalStorageBackend
+
+
+def ops_per_second(func: Callable[[str], object], names: List[str]) -> float:
+    start = time.perf_counter()
+    for name in names:
+        func(name)
+    return len(names) / (time.perf_counter() - start)
+
+
+def bench(backend: StorageBackend, objects: int, size_kb: int) -> None:
+    payload = os.urandom(size_kb * 1024)
+    names = [f"bench-{uuid.uuid4().hex}.bin" for _ in range(objects)]
+
+    put = ops_per_second(lambda name: backend.put_bytes(name, payload, "application/octet-stream"), names)
+    get = ops_per_second(backend.get, names)
+    exists = ops_per_second(backend.exists, names)
+    delete = ops_per_second(backend.delete, names)
+
+    mb_per_op = size_kb / 1024
+    print(f"{backend.name:>6}: put {put:8.1f}/s ({put * mb_per_op:7.1f} MB/s)  "
+          f"get {get:8.1f}/s ({get * mb_per_op:7.1f} MB/s)  exists {exists:8.1f}/s  delete {delete:8.1f}/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=256)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        bench(LocalStorageBackend(root), args.objects, args.size_kb)
+
+    try:
+        from app.core.storage.minio_backend import MinioStorageBackend
+        minio_backend = MinioStorageBackend()
+        minio_backend.exists("bench-probe")
+    except Exception as e:
+        print(f" minio: skipped ({e})")
+        return
+    bench(minio_backend, args.objects, args.size_kb)
+
+
+if __name__ == "__main__":
+    main()
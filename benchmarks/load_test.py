@@ -0,0 +1,253 @@
+"""End-to-end load test against the real application.
+
+Runs a closed-loop workload with a fixed number of concurrent clients and reports
+throughput and p50/p99 latency per endpoint. Seed the database first with
+benchmarks.seed_data. Without --base-url the app is served in-process through
+httpx's ASGI transport. Set STORAGE_BACKEND=local to use the local disk backend
+as a stand-in for MinIO.
+
+Workloads: feed, search, likes, uploads, signin, or mixed (a weighted blend).
+
+    python -m benchmarks.seed_data --users 200 --posts 2000
+    python -m benchmarks.load_test --workload mixed --duration 30 --concurrency 32 --save main
+    python -m benchmarks.load_test --workload mixed --duration 30 --concurrency 32 --compare main
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from app.core.config.config import settings
+from benchmarks.seed_data import BENCH_PASSWORD, LOCATIONS, TITLES, bench_username
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+API = settings.API_V1_STR
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def make_png(width: int, height: int, rng: random.Random) -> bytes:
+    """A valid noise PNG, unique per call so uploads are not deduplicated by content hash"""
+    raw = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    async def timed(
+        self, endpoint: str, request: Awaitable[httpx.Response], started: Optional[float] = None
+    ) -> Optional[httpx.Response]:
+        """Await the request and record its latency, measured from `started` when given"""
+        started = time.perf_counter() if started is None else started
+        try:
+            response = await request
+        except httpx.HTTPError:
+            response = None
+        self.latencies.setdefault(endpoint, []).append(time.perf_counter() - started)
+        if response is None or response.status_code >= 400:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        return response
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        return {
+            endpoint: {
+                "requests": len(values),
+                "errors": self.errors.get(endpoint, 0),
+                "throughput": round(len(values) / elapsed, 2),
+                "p50Ms": round(percentile(values, 0.50) * 1000, 2),
+                "p99Ms": round(percentile(values, 0.99) * 1000, 2),
+            }
+            for endpoint, values in sorted(self.latencies.items())
+        }
+
+
+class LoadContext:
+    def __init__(self, client: httpx.AsyncClient, users: int, rng: random.Random):
+        self.client = client
+        self.users = users
+        self.rng = rng
+        self.recorder = LatencyRecorder()
+        self.tokens: List[str] = []
+        self.post_ids: List[int] = []
+
+    def auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    async def prepare(self, signed_in: int) -> None:
+        """Sign in a pool of users and collect post ids, not part of the measurement"""
+        for index in range(min(signed_in, self.users)):
+            response = await self.client.post(
+                f"{API}/auth/sign-in", json={"username": bench_username(index), "password": BENCH_PASSWORD}
+            )
+            response.raise_for_status()
+            self.tokens.append(response.json()["token"])
+        response = await self.client.get(f"{API}/posts/get-posts-data", params={"limit": 100, "sort": "likes_desc"})
+        response.raise_for_status()
+        self.post_ids = [post["id"] for post in response.json()["content"]]
+        if not self.tokens or not self.post_ids:
+            raise SystemExit("No benchmark data, run `python -m benchmarks.seed_data` first")
+
+
+async def feed(ctx: LoadContext) -> None:
+    headers = ctx.auth() if ctx.rng.random() < 0.5 else {}
+    params = {"page": ctx.rng.randrange(10), "limit": 10, "sort": "latest"}
+    await ctx.recorder.timed("GET posts/get-posts-data", ctx.client.get(f"{API}/posts/get-posts-data", params=params, headers=headers))
+
+
+async def search(ctx: LoadContext) -> None:
+    term = f"location={ctx.rng.choice(LOCATIONS)}" if ctx.rng.random() < 0.5 else f"title={ctx.rng.choice(TITLES)}"
+    params = {"page": 0, "limit": 10, "sort": "likes_desc", "search": term}
+    await ctx.recorder.timed("GET posts/get-posts-data?search", ctx.client.get(f"{API}/posts/get-posts-data", params=params))
+
+
+async def likes(ctx: LoadContext) -> None:
+    # A handful of hot posts take every like, which is where row lock contention shows up
+    post_id = ctx.rng.choice(ctx.post_ids[:5])
+    await ctx.recorder.timed("POST posts/like-post", ctx.client.post(f"{API}/posts/like-post/{post_id}", headers=ctx.auth()))
+
+
+async def uploads(ctx: LoadContext) -> None:
+    post = {"title": f"{ctx.rng.choice(TITLES)} бенчмарк", "location": ctx.rng.choice(LOCATIONS), "description": "Нагрузочный тест"}
+    files = {
+        "post": ("post.json", json.dumps(post).encode("utf-8"), "application/json"),
+        "image": ("image.png", make_png(640, 480, ctx.rng), "image/png"),
+    }
+    await ctx.recorder.timed("POST posts/create-post", ctx.client.post(f"{API}/posts/create-post", files=files, headers=ctx.auth()))
+
+
+async def signin(ctx: LoadContext) -> None:
+    body = {"username": bench_username(ctx.rng.randrange(ctx.users)), "password": BENCH_PASSWORD}
+    await ctx.recorder.timed("POST auth/sign-in", ctx.client.post(f"{API}/auth/sign-in", json=body))
+
+
+WORKLOADS: Dict[str, Callable[[LoadContext], Awaitable[None]]] = {
+    "feed": feed,
+    "search": search,
+    "likes": likes,
+    "uploads": uploads,
+    "signin": signin,
+}
+MIXED_WEIGHTS = {"feed": 60, "search": 15, "likes": 15, "uploads": 2, "signin": 8}
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str]):
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            yield client
+        return
+
+    from app.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=30) as client:
+            yield client
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    if args.workload == "mixed":
+        names, weights = list(MIXED_WEIGHTS), list(MIXED_WEIGHTS.values())
+    else:
+        names, weights = [args.workload], [1]
+
+    async with open_client(args.base_url) as client:
+        ctx = LoadContext(client, args.users, rng)
+        await ctx.prepare(args.signed_in)
+
+        deadline = time.perf_counter() + args.duration
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                await WORKLOADS[rng.choices(names, weights)[0]](ctx)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "workload": args.workload,
+        "concurrency": args.concurrency,
+        "duration": round(elapsed, 2),
+        "endpoints": ctx.recorder.summary(elapsed),
+    }
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Print the per-endpoint table and return the endpoints whose p99 regressed"""
+    def delta(current: float, previous: Optional[float]) -> str:
+        if not previous:
+            return ""
+        return f" ({(current - previous) / previous * 100:+.0f}%)"
+
+    print(f"{'endpoint':<34} {'req':>7} {'err':>5} {'req/s':>16} {'p50 ms':>16} {'p99 ms':>16}")
+    regressions = []
+    for endpoint, stats in result["endpoints"].items():
+        previous = (baseline or {}).get("endpoints", {}).get(endpoint, {})
+        print(f"{endpoint:<34} {stats['requests']:>7} {stats['errors']:>5} "
+              f"{stats['throughput']:>8.1f}{delta(stats['throughput'], previous.get('throughput')):>8} "
+              f"{stats['p50Ms']:>8.1f}{delta(stats['p50Ms'], previous.get('p50Ms')):>8} "
+              f"{stats['p99Ms']:>8.1f}{delta(stats['p99Ms'], previous.get('p99Ms')):>8}")
+        if previous.get("p99Ms"):
+            regressions.append((endpoint, (stats["p99Ms"] - previous["p99Ms"]) / previous["p99Ms"] * 100))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", choices=[*WORKLOADS, "mixed"], default="mixed")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=200, help="number of seeded benchmark users")
+    parser.add_argument("--signed-in", type=int, default=50, help="users signed in before the run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    parser.add_argument("--save", metavar="NAME", help="store the result as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="diff the result against baselines/NAME.json")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="allowed p99 regression in percent")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), encoding="utf-8") as file:
+            baseline = json.load(file)
+    regressions = print_report(result, baseline)
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, f"{args.save}.json"), "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
+
+    failed = [(endpoint, change) for endpoint, change in regressions if change > args.max_regression]
+    for endpoint, change in failed:
+        print(f"p99 regression on {endpoint}: {change:+.0f}% (allowed {args.max_regression:.0f}%)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
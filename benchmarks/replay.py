@@ -0,0 +1,177 @@
+"""Replay recorded request traffic against a local instance.
+
+The traffic file is JSON lines, one request per line:
+
+    {"timestamp": 1718000000.25, "method": "GET", "path": "/api/v1/posts/get-posts-data?page=1",
+     "user": "alice", "body": null}
+
+`timestamp` is in seconds (a number or an ISO 8601 string), `headers` and `body`
+(sent as JSON) are optional. The recorded identity, taken from `user` or from the
+Authorization header, is mapped onto a seeded benchmark user and its token is
+replaced, so the replay works against a database filled by benchmarks.seed_data.
+Lines that are not request records are skipped.
+
+Replay is open-loop: requests are sent at their recorded offsets divided by
+--time-scale (or at a fixed --rate), whether or not earlier ones have finished.
+Latency is measured from the scheduled send time, so queueing behind
+--concurrency shows up in the numbers instead of slowing the arrival rate.
+
+    python -m benchmarks.replay traffic.jsonl --time-scale 4 --concurrency 64
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Set
+from urllib.parse import urlsplit
+
+import httpx
+
+from benchmarks.load_test import LatencyRecorder, open_client, print_report
+from benchmarks.seed_data import BENCH_PASSWORD, bench_username
+from app.core.config.config import settings
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream request records from the file, skipping lines that are not requests"""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and "method" in record and "path" in record:
+                yield record
+
+
+def record_time(record: Dict[str, Any]) -> Optional[float]:
+    timestamp = record.get("timestamp")
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+    return None
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """Group requests by route, numeric path segments are collapsed into {id}"""
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', urlsplit(path).path)}"
+
+
+class TokenRewriter:
+    """Maps recorded identities onto seeded users and signs them in on first use"""
+
+    def __init__(self, client: httpx.AsyncClient, users: int):
+        self.client = client
+        self.users = users
+        self._tokens: Dict[int, str] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    @staticmethod
+    def identity(record: Dict[str, Any]) -> Optional[str]:
+        if record.get("user"):
+            return str(record["user"])
+        headers = {key.lower(): value for key, value in (record.get("headers") or {}).items()}
+        return headers.get("authorization")
+
+    async def headers(self, record: Dict[str, Any]) -> Dict[str, str]:
+        headers = {
+            key: value for key, value in (record.get("headers") or {}).items()
+            if key.lower() not in ("authorization", "host", "content-length")
+        }
+        identity = self.identity(record)
+        if identity is None:
+            return headers
+
+        index = int(hashlib.sha1(identity.encode("utf-8")).hexdigest(), 16) % self.users
+        lock = self._locks.setdefault(index, asyncio.Lock())
+        async with lock:
+            if index not in self._tokens:
+                response = await self.client.post(
+                    f"{settings.API_V1_STR}/auth/sign-in",
+                    json={"username": bench_username(index), "password": BENCH_PASSWORD},
+                )
+                response.raise_for_status()
+                self._tokens[index] = response.json()["token"]
+        headers["Authorization"] = f"Bearer {self._tokens[index]}"
+        return headers
+
+
+async def replay(args: argparse.Namespace) -> Dict[str, Any]:
+    recorder = LatencyRecorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    pending: Set[asyncio.Task] = set()
+    sent = 0
+
+    async with open_client(args.base_url) as client:
+        tokens = TokenRewriter(client, args.users)
+
+        async def send(record: Dict[str, Any], scheduled: float) -> None:
+            async with semaphore:
+                # The first request of each identity also waits for that user's sign-in
+                headers = await tokens.headers(record)
+                request = client.request(
+                    record["method"].upper(), record["path"], headers=headers, json=record.get("body")
+                )
+                await recorder.timed(endpoint_name(record["method"], record["path"]), request, started=scheduled)
+
+        started = time.perf_counter()
+        first_timestamp = None
+        for index, record in enumerate(read_records(args.file)):
+            if args.limit and index >= args.limit:
+                break
+            if args.rate:
+                offset = index / args.rate
+            else:
+                timestamp = record_time(record)
+                if first_timestamp is None and timestamp is not None:
+                    first_timestamp = timestamp
+                offset = (timestamp - first_timestamp) / args.time_scale if timestamp is not None else 0.0
+
+            scheduled = started + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            task = asyncio.create_task(send(record, scheduled))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            sent += 1
+
+        if pending:
+            await asyncio.gather(*pending)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "file": args.file,
+        "requests": sent,
+        "duration": round(elapsed, 2),
+        "endpoints": recorder.summary(elapsed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", nargs="?", default="requests.jsonl")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="replay speed-up relative to the recording")
+    parser.add_argument("--rate", type=float, help="fixed arrival rate in requests per second, ignores timestamps")
+    parser.add_argument("--concurrency", type=int, default=32, help="maximum requests in flight")
+    parser.add_argument("--users", type=int, default=200, help="number of seeded benchmark users")
+    parser.add_argument("--limit", type=int, help="replay only the first N requests")
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    args = parser.parse_args()
+
+    result = asyncio.run(replay(args))
+    if not result["requests"]:
+        raise SystemExit(f"No request records found in {args.file}")
+    print(f"replayed {result['requests']} requests in {result['duration']}s")
+    print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Generate benchmark users, posts and likes directly in the database.
+
+Users are named bench_user_00000, bench_user_00001, ... and share one password
+(BENCH_PASSWORD) so load tests can sign any of them in. Generation is seeded
+and therefore reproducible. Existing benchmark rows are removed first.
+
+    python -m benchmarks.seed_data --users 1000 --posts 20000 --likes-per-user 50
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import delete, func, insert, select, update
+
+from app.core.database import engine
+from app.core.images import DEFAULT_POST_IMAGE, DEFAULT_USER_IMAGE
+from app.core.security import get_password_hash
+from app.models.enums import PostStatus, Role
+from app.models.post import Post
+from app.models.user import User, user_post_likes
+
+BENCH_USER_PREFIX = "bench_user_"
+BENCH_PASSWORD = "bench_password1"
+BATCH_SIZE = 1000
+
+LOCATIONS = ["Санторини", "Рим", "Париж", "Киото", "Байкал", "Камчатка", "Лиссабон", "Исландия", "Бали", "Алтай"]
+TITLES = ["Закат", "Горы", "Старый город", "Побережье", "Озеро", "Рынок", "Храм", "Долина", "Маяк", "Вулкан"]
+
+
+def bench_username(index: int) -> str:
+    return f"{BENCH_USER_PREFIX}{index:05d}"
+
+
+async def reset(conn) -> None:
+    bench_users = select(User.id).where(User.username.like(f"{BENCH_USER_PREFIX}%"))
+    bench_posts = select(Post.id).where(Post.author_id.in_(bench_users))
+    await conn.execute(delete(user_post_likes).where(
+        user_post_likes.c.user_id.in_(bench_users) | user_post_likes.c.post_id.in_(bench_posts)
+    ))
+    await conn.execute(delete(Post).where(Post.author_id.in_(bench_users)))
+    await conn.execute(delete(User).where(User.username.like(f"{BENCH_USER_PREFIX}%")))
+
+
+async def insert_batched(conn, table, rows: List[dict], returning=None) -> List[int]:
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        statement = insert(table)
+        if returning is not None:
+            result = await conn.execute(statement.returning(returning), rows[start:start + BATCH_SIZE])
+            ids.extend(result.scalars().all())
+        else:
+            await conn.execute(statement, rows[start:start + BATCH_SIZE])
+    return ids
+
+
+async def seed(users: int, posts: int, likes_per_user: int, verified_ratio: float, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    # bcrypt is slow on purpose, every benchmark user gets the same hash
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    now = datetime.utcnow()
+
+    async with engine.begin() as conn:
+        await reset(conn)
+
+        started = time.perf_counter()
+        user_ids = await insert_batched(conn, User.__table__, [
+            {
+                "username": bench_username(i),
+                "email": f"{bench_username(i)}@bench.local",
+                "password": password_hash,
+                "image_name": DEFAULT_USER_IMAGE,
+                "role": Role.ROLE_USER,
+                "updated_at": now,
+            }
+            for i in range(users)
+        ], returning=User.id)
+
+        post_ids = await insert_batched(conn, Post.__table__, [
+            {
+                "title": f"{rng.choice(TITLES)} {i}",
+                "author_id": rng.choice(user_ids),
+                "date": now - timedelta(minutes=rng.randrange(60 * 24 * 365)),
+                "location": rng.choice(LOCATIONS),
+                "description": " ".join(rng.choices(TITLES + LOCATIONS, k=30)),
+                "image_name": DEFAULT_POST_IMAGE,
+                "likes": 0,
+                "status": PostStatus.STATUS_VERIFIED if rng.random() < verified_ratio else PostStatus.STATUS_NOT_CHECKED,
+                "updated_at": now,
+            }
+            for i in range(posts)
+        ], returning=Post.id)
+
+        # Likes are skewed towards a hot 1% of posts, like in real feeds
+        hot_posts = post_ids[:max(1, len(post_ids) // 100)]
+        likes = set()
+        for user_id in user_ids:
+            for _ in range(min(likes_per_user, len(post_ids))):
+                likes.add((user_id, rng.choice(hot_posts) if rng.random() < 0.3 else rng.choice(post_ids)))
+        await insert_batched(conn, user_post_likes, [{"user_id": u, "post_id": p} for u, p in likes])
+
+        like_count = (
+            select(func.count())
+            .select_from(user_post_likes)
+            .where(user_post_likes.c.post_id == Post.id)
+            .scalar_subquery()
+        )
+        bench_users = select(User.id).where(User.username.like(f"{BENCH_USER_PREFIX}%"))
+        await conn.execute(update(Post).where(Post.author_id.in_(bench_users)).values(likes=like_count))
+
+    print(f"Seeded {len(user_ids)} users, {len(post_ids)} posts, {len(likes)} likes "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--likes-per-user", type=int, default=20)
+    parser.add_argument("--verified-ratio", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    try:
+        await seed(args.users, args.posts, args.likes_per_user, args.verified_ratio, args.seed)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+"""Create the schema of an empty database and stamp it with the migration heads.
+
+Existing databases are upgraded with `alembic upgrade head` instead.
+
+    python -m scripts.init_db
+"""
+import asyncio
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.core.schema import get_expected_heads
+from app.models.base import Base
+from app.models import post, post_event, stored_object, user  # noqa: F401 - register the tables
+
+
+async def main() -> None:
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS alembic_version ("
+                "version_num VARCHAR(32) NOT NULL PRIMARY KEY)"
+            ))
+            await conn.execute(text("DELETE FROM alembic_version"))
+            for head in sorted(get_expected_heads()):
+                await conn.execute(text("INSERT INTO alembic_version (version_num) VALUES (:head)"), {"head": head})
+        print(f"Schema created at {sorted(get_expected_heads())}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
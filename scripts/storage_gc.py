@@ -0,0 +1,35 @@
+"""Delete stored objects that are no longer referenced by any post or user.
+
+    python -m scripts.storage_gc --grace-hours 24            # dry run, prints stats
+    python -m scripts.storage_gc --grace-hours 24 --delete   # actually delete
+"""
+import argparse
+import asyncio
+import json
+import logging
+from datetime import timedelta
+
+from app.core.database import async_session, engine
+from app.core.services.minio_service import MinioService
+from app.core.services.storage_gc_service import StorageGarbageCollector
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grace-hours", type=float, default=24, help="keep objects younger than this")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--delete", action="store_true", help="delete objects instead of a dry run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        async with async_session() as session:
+            collector = StorageGarbageCollector(session, MinioService(), batch_size=args.batch_size)
+            stats = await collector.run(timedelta(hours=args.grace_hours), dry_run=not args.delete)
+        print(json.dumps(stats, indent=2))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
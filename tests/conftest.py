@@ -0,0 +1,64 @@
+"""Shared fixtures.
+
+Settings are read when `app` is first imported, so the environment is set up
+here before any test module imports it. Database tests run against
+TEST_DATABASE_URL and are skipped without it; the schema there is dropped and
+recreated for every test, never point it at a database with data you need.
+"""
+import os
+import tempfile
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql+asyncpg://postgres@localhost/travel_journal_test"
+os.environ.setdefault("POSTGRESQL_USER", "postgres")
+os.environ.setdefault("POSTGRESQL_PASSWORD", "postgres")
+os.environ.setdefault("TOKEN_SIGNING_KEY", "test-signing-key-with-at-least-32-characters")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("MINIO_URL", "http://localhost:9000")
+os.environ.setdefault("MINIO_BUCKET", "test")
+os.environ.setdefault("MINIO_ACCESS_KEY", "test")
+os.environ.setdefault("MINIO_SECRET_KEY", "test")
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["LOCAL_STORAGE_PATH"] = tempfile.mkdtemp(prefix="travel-journal-tests-")
+os.environ["IMAGE_DISK_CACHE_BYTES"] = "0"
+# The default policies stay installed, tests give their clients distinct IPs where limits matter
+os.environ["RATE_LIMIT_ENABLED"] = "true"
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+os.environ["SCHEMA_VERSION_CHECK"] = "off"
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db_engine():
+    """Engine of the application over an empty schema"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from app.core.database import engine
+    from app.models.base import Base
+    from app.models import post, post_event, stored_object, user  # noqa: F401 - register the tables
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(db_engine):
+    """Client of the application, without its lifespan: no job queue and no event bus"""
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
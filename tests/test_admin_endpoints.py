@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import insert
+
+from app.core.services.jwt_service import JWTService
+from app.models.enums import Role
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+OPERATIONAL_ENDPOINTS = [
+    "/api/v1/jobs/get-metrics",
+    "/api/v1/jobs/get-recent-jobs",
+    "/api/v1/metrics/get-phase-metrics",
+    "/api/v1/metrics/get-query-metrics",
+    "/api/v1/metrics/get-event-metrics",
+]
+
+
+@pytest.fixture
+async def tokens(db_engine):
+    users = [
+        {"username": role.value.lower(), "email": f"{role.value.lower()}@example.com",
+         "password": "not-a-real-hash", "role": role}
+        for role in (Role.ROLE_USER, Role.ROLE_ADMIN)
+    ]
+    async with db_engine.begin() as conn:
+        user_ids = (await conn.execute(insert(User).returning(User.id), users)).scalars().all()
+    jwt_service = JWTService()
+    return {
+        user["role"]: jwt_service.generate_token({
+            "id": user_id, "username": user["username"], "email": user["email"], "role": user["role"].value,
+        })
+        for user_id, user in zip(user_ids, users)
+    }
+
+
+@pytest.mark.parametrize("path", OPERATIONAL_ENDPOINTS)
+async def test_operational_endpoints_require_admin(client, tokens, path):
+    response = await client.get(path, headers={"Authorization": f"Bearer {tokens[Role.ROLE_USER]}"})
+    assert response.status_code == 401
+
+    response = await client.get(path, headers={"Authorization": f"Bearer {tokens[Role.ROLE_ADMIN]}"})
+    assert response.status_code == 200
+
+
+async def test_job_status_requires_admin(client, tokens):
+    path = "/api/v1/jobs/get-job-status/unknown"
+    response = await client.get(path, headers={"Authorization": f"Bearer {tokens[Role.ROLE_USER]}"})
+    assert response.status_code == 401
+
+    response = await client.get(path, headers={"Authorization": f"Bearer {tokens[Role.ROLE_ADMIN]}"})
+    assert response.status_code == 404
@@ -0,0 +1,33 @@
+import warnings
+
+import orjson
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import SADeprecationWarning
+
+from app.core.services.jwt_service import JWTService
+from app.models.enums import PostStatus, Role
+from app.models.post import Post
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_export_streams_every_post_without_deprecation_warnings(client, db_engine):
+    async with db_engine.begin() as conn:
+        author_id = (await conn.execute(insert(User).returning(User.id), [{
+            "username": "author", "email": "author@example.com", "password": "not-a-real-hash", "role": Role.ROLE_USER,
+        }])).scalar_one()
+        await conn.execute(insert(Post), [
+            {"title": f"Post {index}", "author_id": author_id, "location": "Рим", "status": PostStatus.STATUS_VERIFIED}
+            for index in range(3)
+        ])
+    token = JWTService().generate_token({"id": author_id, "username": "author", "role": Role.ROLE_USER.value})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", SADeprecationWarning)
+        response = await client.get("/api/v1/posts/export-posts-data", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    rows = [orjson.loads(line) for line in response.content.splitlines() if line]
+    assert sorted(row["title"] for row in rows) == ["Post 0", "Post 1", "Post 2"]
@@ -0,0 +1,56 @@
+import pytest
+
+from app.core.event_bus import LifecycleEvent, PostEventType
+from app.core.feed_updates import FeedUpdates, format_sse
+from app.models.enums import PostStatus
+
+pytestmark = pytest.mark.anyio
+
+AUTHOR_ID = 1
+OTHER_ID = 2
+
+
+async def connect(feed, user_id):
+    """Opens a stream and reads the retry preamble, which registers the connection"""
+    stream = feed.stream(user_id)
+    await stream.__anext__()
+    return stream
+
+
+def drain(feed, user_id):
+    messages = []
+    for connection in feed._by_user.get(user_id, ()):
+        while not connection.queue.empty():
+            messages.append(connection.queue.get_nowait())
+    return messages
+
+
+@pytest.fixture
+async def feed():
+    feed = FeedUpdates(max_connections=10, queue_size=10, heartbeat=60)
+    streams = [await connect(feed, AUTHOR_ID), await connect(feed, OTHER_ID)]
+    yield feed
+    for stream in streams:
+        await stream.aclose()
+
+
+async def test_rejected_post_leaves_other_feeds_and_returns_on_resubmit(feed):
+    payload = {"authorId": AUTHOR_ID}
+    await feed.handle_events([LifecycleEvent(PostEventType.REJECTED, 7, 99, payload)])
+    assert drain(feed, OTHER_ID) == [format_sse("deleted", {"id": 7})]
+    assert drain(feed, AUTHOR_ID) == [format_sse("moderation", {"id": 7, "decision": "rejected"})]
+
+    payload = {"status": PostStatus.STATUS_NOT_CHECKED.value, "authorId": AUTHOR_ID}
+    await feed.handle_events([LifecycleEvent(PostEventType.RESUBMITTED, 7, AUTHOR_ID, payload)])
+    assert drain(feed, OTHER_ID) == [format_sse("post", {"id": 7})]
+    assert drain(feed, AUTHOR_ID) == []
+
+
+async def test_denied_post_deltas_reach_the_author_only(feed):
+    payload = {"likes": 3, "status": PostStatus.STATUS_DENIED.value, "authorId": AUTHOR_ID}
+    await feed.handle_events([
+        LifecycleEvent(PostEventType.LIKED, 7, OTHER_ID, payload),
+        LifecycleEvent(PostEventType.DELETED, 7, AUTHOR_ID, payload),
+    ])
+    assert drain(feed, OTHER_ID) == []
+    assert drain(feed, AUTHOR_ID) == [format_sse("deleted", {"id": 7}), format_sse("likes", {"id": 7, "likes": 3})]
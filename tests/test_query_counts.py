@@ -0,0 +1,110 @@
+"""Statement budgets of the hot endpoints.
+
+The budgets are the current counts: a change adding a query to one of these
+requests has to raise its budget here on purpose. Counts must not depend on the
+page size or the number of likes, an N+1 shows up as a difference between the
+small and the large case.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.query_counter import assert_max_queries, count_queries
+from app.core.services.jwt_service import JWTService
+from app.models.enums import PostStatus, Role
+from app.models.post import Post
+from app.models.user import User, user_post_likes
+
+pytestmark = pytest.mark.anyio
+
+API = "/api/v1/posts"
+
+FEED_QUERIES = 7
+POST_DETAIL_QUERIES = 6
+LIKE_QUERIES = 14
+
+POSTS = 12
+LIKERS = 8
+
+
+@pytest.fixture
+async def seeded(db_engine):
+    """An author with verified posts, the first one liked by every other user"""
+    now = datetime.utcnow()
+    users = [
+        {"username": f"user_{index:02d}", "email": f"user_{index:02d}@example.com",
+         "password": "not-a-real-hash", "role": Role.ROLE_USER}
+        for index in range(LIKERS + 2)
+    ]
+    async with db_engine.begin() as conn:
+        user_ids = (await conn.execute(insert(User).returning(User.id), users)).scalars().all()
+        author_id, viewer_id, liker_ids = user_ids[0], user_ids[1], user_ids[2:]
+        post_ids = (await conn.execute(insert(Post).returning(Post.id), [
+            {"title": f"Post {index}", "author_id": author_id, "location": "Рим", "description": "",
+             "date": now - timedelta(minutes=index), "status": PostStatus.STATUS_VERIFIED}
+            for index in range(POSTS)
+        ])).scalars().all()
+        await conn.execute(insert(user_post_likes), [
+            {"user_id": liker_id, "post_id": post_ids[0]} for liker_id in liker_ids
+        ])
+        await conn.execute(Post.__table__.update().where(Post.id == post_ids[0]).values(likes=len(liker_ids)))
+
+    jwt_service = JWTService()
+    headers = {
+        user_id: {"Authorization": "Bearer " + jwt_service.generate_token({
+            "id": user_id, "username": user["username"], "email": user["email"], "role": Role.ROLE_USER.value,
+        })}
+        for user_id, user in zip(user_ids, users)
+    }
+    return {"posts": post_ids, "viewer": headers[viewer_id]}
+
+
+async def test_feed_query_count(client, seeded):
+    with assert_max_queries(FEED_QUERIES):
+        response = await client.get(f"{API}/get-posts-data", params={"limit": 10}, headers=seeded["viewer"])
+    assert response.status_code == 200
+    assert len(response.json()["content"]) == 10
+
+
+async def test_feed_query_count_does_not_grow_with_page_size(client, seeded):
+    with count_queries() as small:
+        await client.get(f"{API}/get-posts-data", params={"limit": 1}, headers=seeded["viewer"])
+    with count_queries() as large:
+        await client.get(f"{API}/get-posts-data", params={"limit": POSTS}, headers=seeded["viewer"])
+    assert large.count == small.count
+
+
+async def test_post_detail_query_count(client, seeded):
+    with assert_max_queries(POST_DETAIL_QUERIES):
+        response = await client.get(f"{API}/get-post-data/{seeded['posts'][0]}", headers=seeded["viewer"])
+    assert response.status_code == 200
+    assert response.json()["likes"] == LIKERS
+
+
+async def test_like_query_count(client, seeded):
+    with assert_max_queries(LIKE_QUERIES):
+        response = await client.post(f"{API}/like-post/{seeded['posts'][1]}", headers=seeded["viewer"])
+    assert response.status_code == 200
+    assert response.json() == 1
+
+
+async def test_like_query_count_does_not_grow_with_likes(client, seeded):
+    with count_queries() as unliked:
+        await client.post(f"{API}/like-post/{seeded['posts'][1]}", headers=seeded["viewer"])
+    with count_queries() as liked:
+        await client.post(f"{API}/like-post/{seeded['posts'][0]}", headers=seeded["viewer"])
+    assert liked.count == unliked.count
+
+
+async def test_failed_statement_leaves_no_timing_state(db_engine):
+    async with db_engine.connect() as conn:
+        with count_queries() as stats:
+            with pytest.raises(DBAPIError):
+                await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.rollback()
+            await conn.execute(text("SELECT 1"))
+        info = (await conn.get_raw_connection()).info
+    assert "query_start" not in info
+    assert stats.count == 1
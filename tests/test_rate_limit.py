@@ -0,0 +1,198 @@
+import httpx
+import pytest
+from starlette.responses import PlainTextResponse
+
+from app.core import rate_limit
+from app.core.middleware.rate_limit import RateLimitMiddleware
+from app.core.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimiter,
+    RateLimitPolicy,
+    SQLiteRateLimitBackend,
+)
+from app.core.services.jwt_service import JWTService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    """Stands in for the `time` module of the rate limiter, advanced by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryRateLimitBackend(max_keys=100)
+    return SQLiteRateLimitBackend(str(tmp_path / "buckets.sqlite3"))
+
+
+def test_policy_parse():
+    policy = RateLimitPolicy.parse("user:30/60", "search")
+    assert policy == RateLimitPolicy("user", 30, 60.0, "search")
+    assert policy.refill_rate == 0.5
+
+
+@pytest.mark.parametrize("spec", ["30/60", "host:30/60", "ip:0/60", "ip:30/0", "ip:many/60"])
+def test_policy_parse_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        RateLimitPolicy.parse(spec)
+
+
+async def test_bucket_refill_and_retry_after(backend, clock):
+    bucket = ("sign-in|ip:1.2.3.4", 2, 0.5)
+    assert await backend.acquire([bucket]) == [0.0]
+    assert await backend.acquire([bucket]) == [0.0]
+    assert await backend.acquire([bucket]) == [2.0]
+
+    clock.now += 1.0
+    assert await backend.acquire([bucket]) == [pytest.approx(1.0)]
+
+    clock.now += 1.0
+    assert await backend.acquire([bucket]) == [0.0]
+    assert await backend.acquire([bucket]) == [pytest.approx(2.0)]
+
+
+async def test_refill_is_capped_at_capacity(backend, clock):
+    bucket = ("sign-in|ip:1.2.3.4", 2, 0.5)
+    await backend.acquire([bucket])
+    clock.now += 3600
+    assert await backend.acquire([bucket]) == [0.0]
+    assert await backend.acquire([bucket]) == [0.0]
+    assert await backend.acquire([bucket]) == [2.0]
+
+
+async def test_rejected_request_takes_no_tokens(backend, clock):
+    roomy = ("roomy|ip:1.2.3.4", 10, 1.0)
+    tight = ("tight|ip:1.2.3.4", 1, 1.0)
+    assert await backend.acquire([roomy, tight]) == [0.0, 0.0]
+    for _ in range(5):
+        assert await backend.acquire([roomy, tight]) == [0.0, 1.0]
+    # The roomy bucket was charged once, by the allowed request
+    assert await backend.acquire([roomy] * 9) == [0.0] * 9
+
+
+async def test_memory_backend_evicts_least_recently_used(clock):
+    backend = MemoryRateLimitBackend(max_keys=2)
+    for key in ("a", "b"):
+        await backend.acquire([(key, 1, 0.001)])
+    await backend.acquire([("a", 1, 0.001)])
+    await backend.acquire([("c", 1, 0.001)])
+    # "b" was the least recently used and starts full again, "a" is still empty
+    assert (await backend.acquire([("a", 1, 0.001)]))[0] > 0
+    assert await backend.acquire([("b", 1, 0.001)]) == [0.0]
+
+
+def test_match_static_templated_and_query_param():
+    limiter = RateLimiter(MemoryRateLimitBackend(100), {
+        "POST /api/v1/auth/sign-in": "ip:10/60",
+        "POST /api/v1/posts/like-post/{post_id}": "user:60/60",
+        "GET /api/v1/posts/get-posts-data?search": "user:30/60",
+    })
+    assert [name for name, _ in limiter.match("POST", "/api/v1/auth/sign-in", b"")] == ["POST /api/v1/auth/sign-in"]
+    assert [name for name, _ in limiter.match("POST", "/api/v1/posts/like-post/42", b"")] == [
+        "POST /api/v1/posts/like-post/{post_id}"
+    ]
+    assert limiter.match("POST", "/api/v1/posts/like-post/42/extra", b"") == []
+    assert limiter.match("GET", "/api/v1/posts/like-post/42", b"") == []
+    assert [name for name, _ in limiter.match("GET", "/api/v1/posts/get-posts-data", b"page=0&search=rome")] == [
+        "GET /api/v1/posts/get-posts-data?search"
+    ]
+    assert limiter.match("GET", "/api/v1/posts/get-posts-data", b"page=0") == []
+    assert limiter.match("GET", "/api/v1/posts/get-posts-data", b"search=") == []
+
+
+def test_match_falls_back_to_default():
+    limiter = RateLimiter(MemoryRateLimitBackend(100), {"POST /api/v1/auth/sign-in": "ip:10/60"}, default="ip:100/60")
+    assert limiter.match("GET", "/api/v1/users/get-user-data", b"") == [("default", limiter.default)]
+
+
+async def test_check_reports_the_limiting_policy(clock):
+    limiter = RateLimiter(MemoryRateLimitBackend(100), {
+        "GET /search": "ip:100/60",
+        "GET /search?q": "user:1/60",
+    })
+    policies = limiter.match("GET", "/search", b"q=rome")
+    assert await limiter.check(policies, "1.2.3.4", 7) is None
+    assert await limiter.check(policies, "1.2.3.4", 7) == ("GET /search?q", 60.0)
+    # Another user has a bucket of their own
+    assert await limiter.check(policies, "1.2.3.4", 8) is None
+    assert limiter.get_metrics()["policies"] == {
+        "GET /search": {"allowed": 2, "limited": 0},
+        "GET /search?q": {"allowed": 2, "limited": 1},
+    }
+
+
+async def ok_app(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+def limited_client(policies):
+    limiter = RateLimiter(MemoryRateLimitBackend(100), policies)
+    transport = httpx.ASGITransport(app=RateLimitMiddleware(ok_app, limiter))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def test_middleware_rejects_with_429_and_retry_after(clock):
+    async with limited_client({"POST /api/v1/auth/sign-in": "ip:2/60"}) as client:
+        assert (await client.post("/api/v1/auth/sign-in")).status_code == 200
+        assert (await client.post("/api/v1/auth/sign-in")).status_code == 200
+        response = await client.post("/api/v1/auth/sign-in")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "30"
+        assert response.json() == {"errors": ["Too many requests, try again later"]}
+        # Routes without a policy are not limited
+        assert (await client.get("/api/v1/posts/get-posts-data")).status_code == 200
+
+        clock.now += 30
+        assert (await client.post("/api/v1/auth/sign-in")).status_code == 200
+
+
+async def test_middleware_limits_users_by_token(clock):
+    jwt_service = JWTService()
+    tokens = {
+        user_id: jwt_service.generate_token({"id": user_id, "username": f"user_{user_id}", "role": "ROLE_USER"})
+        for user_id in (1, 2)
+    }
+    async with limited_client({"POST /api/v1/posts/like-post/{post_id}": "user:1/60"}) as client:
+        headers = {"Authorization": f"Bearer {tokens[1]}"}
+        assert (await client.post("/api/v1/posts/like-post/5", headers=headers)).status_code == 200
+        assert (await client.post("/api/v1/posts/like-post/6", headers=headers)).status_code == 429
+        headers = {"Authorization": f"Bearer {tokens[2]}"}
+        assert (await client.post("/api/v1/posts/like-post/5", headers=headers)).status_code == 200
+
+
+async def test_application_429_carries_cors_headers_and_is_counted():
+    from app.core.middleware.metrics import metrics
+    from app.main import app
+
+    origin = "http://localhost:3000"
+    # A client IP of its own, the application's limiter is shared by the whole test run
+    transport = httpx.ASGITransport(app=app, client=("10.0.0.29", 123))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # "POST /api/v1/auth/sign-up" allows 5 requests a minute per IP, invalid bodies never reach the database
+        for _ in range(5):
+            response = await client.post("/api/v1/auth/sign-up", json={}, headers={"Origin": origin})
+            assert response.status_code == 422
+        requests = metrics.requests
+        response = await client.post("/api/v1/auth/sign-up", json={}, headers={"Origin": origin})
+
+    assert response.status_code == 429
+    assert response.headers["access-control-allow-origin"] == origin
+    assert int(response.headers["Retry-After"]) > 0
+    assert metrics.requests == requests + 1